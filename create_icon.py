@@ -3,13 +3,41 @@
 Create a simple icon for the LunarBit Modpack Updater
 """
 
-from PIL import Image, ImageDraw, ImageFont
 import os
+import io
+import base64
+import zlib
+
+ICON_SIZE = 64
+
+# Pre-rendered output of draw_icon(): zlib-compressed raw RGBA pixels, base64 encoded.
+# Regenerate with draw_icon() if the icon design changes.
+_ICON_DATA = (
+    "eNrtm7ESwyAMQ/MDHTr1mzp26xfmG7ul1730nIIsGeQ7xnA8QSDE8rY5HA4HPp77cUTbarwz6dFi"
+    "uFxv4VZRh17mM1ooc49gjmqhxI7k/qXDauxsDdjcTB0Qe1sVDRDzProvpAYIdlSf6uwofoQGqL0O"
+    "uY+O0iBjjOi+1ededQ0gz/gM/l4NVubPZlfTYGX+rPFk80c1QN9tsvnPrgHW3Ku8AyvzM9e+wjvA"
+    "nnv2GjC/+c1/UNmZ90Hzmx/5n4+pgfnNz/gGVuBn3X9GeD/Mz+FnnYMKuYAZ+VXzHqp5ENZZOHP+"
+    "oxI/61tAKQec4eVDewaV8v+K532mBhn8yh4YNH+G/6lnjEj+Ch64z3Ovx73Zevqt5IH8xr6SD3YE"
+    "f3UPdHX2Xv//P/yV6iAiWkTYZ6iDaWnR4p+5Dmr2+i/X/zkcNeINOAj96g=="
+)
 
 def create_icon():
-    """Create a simple icon for the application"""
+    """Create the application icon from the pre-rendered pixel data"""
+    from PIL import Image
+    
+    pixels = zlib.decompress(base64.b64decode(_ICON_DATA))
+    return Image.frombytes('RGBA', (ICON_SIZE, ICON_SIZE), pixels)
+
+def encode_icon(img):
+    """Encode an icon image into the _ICON_DATA format"""
+    return base64.b64encode(zlib.compress(img.tobytes(), 9)).decode('ascii')
+
+def draw_icon():
+    """Draw the icon from scratch (source of the pre-rendered _ICON_DATA)"""
+    from PIL import Image, ImageDraw
+    
     # Create a 64x64 image with transparent background
-    size = 64
+    size = ICON_SIZE
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     
@@ -17,18 +45,16 @@ def create_icon():
     bg_color = (13, 17, 23, 255)  # Dark background
     primary_color = (88, 166, 255, 255)  # Blue accent
     
-    # Draw background circle
+    # Draw background circle and border in a single pass
     margin = 4
-    draw.ellipse([margin, margin, size-margin, size-margin], fill=bg_color)
-    
-    # Draw border
-    draw.ellipse([margin, margin, size-margin, size-margin], outline=primary_color, width=2)
+    draw.ellipse((margin, margin, size-margin, size-margin),
+                 fill=bg_color, outline=primary_color, width=2)
     
     # Draw rocket emoji or simple shape
     center = size // 2
     
     # Simple rocket shape
-    rocket_points = [
+    rocket_points = (
         (center, margin + 8),      # Top
         (center - 8, center + 8),  # Left
         (center - 4, center + 8),  # Left inner
@@ -36,25 +62,43 @@ def create_icon():
         (center + 4, size - margin - 8),  # Right bottom
         (center + 4, center + 8),  # Right inner
         (center + 8, center + 8),  # Right
-    ]
+    )
     
     draw.polygon(rocket_points, fill=primary_color)
     
     # Add flames
-    flame_points = [
+    flame_points = (
         (center - 3, size - margin - 8),
         (center, size - margin - 2),
         (center + 3, size - margin - 8),
-    ]
+    )
     draw.polygon(flame_points, fill=(248, 81, 73, 255))  # Red color
     
     return img
 
+def icon_is_current(path):
+    """Check if an existing icon file is newer than this script"""
+    try:
+        return os.path.getmtime(path) >= os.path.getmtime(__file__)
+    except OSError:
+        return False
+
+def save_icon(img, path):
+    """Save the icon as PNG, replacing any existing file atomically"""
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', compress_level=1, optimize=False)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(temp_path, path)
+
 if __name__ == "__main__":
     try:
-        icon = create_icon()
-        icon.save("icon.png")
-        print("Icon created successfully: icon.png")
+        if icon_is_current("icon.png"):
+            print("Icon is up to date: icon.png")
+        else:
+            save_icon(create_icon(), "icon.png")
+            print("Icon created successfully: icon.png")
     except ImportError:
         print("PIL (Pillow) not installed. Skipping icon creation.")
         print("Install with: pip install Pillow")
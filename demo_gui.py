@@ -9,12 +9,8 @@ This script shows what the interface looks like without requiring a real modpack
 import tkinter as tk
 from tkinter import messagebox
 import sys
-import os
-from pathlib import Path
-
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Running this script puts its directory first on sys.path, so gui.py imports directly
 try:
     from gui import ModpackUpdaterGUI, LunarBitTheme
 except ImportError:
@@ -32,6 +28,7 @@ class DemoGUI(ModpackUpdaterGUI):
         self.generate_client.set(True)
         self.generate_server.set(False)
         self.overrides_folder.set("overrides")
+        self.demo_after_ids = []
         
     def start_update(self):
         """Demo version that shows sample output instead of running real update"""
@@ -46,7 +43,7 @@ class DemoGUI(ModpackUpdaterGUI):
         self.progress.start()
         
         # Clear output and show demo content
-        self.output_text.delete(1.0, tk.END)
+        self.clear_output()
         self.show_demo_output()
         
     def show_demo_output(self):
@@ -83,31 +80,69 @@ class DemoGUI(ModpackUpdaterGUI):
             "🎉 Generated: Simple-Modpack.mrpack\n"
         ]
         
-        # Add lines with delay to simulate real-time output
-        self.demo_line_index = 0
-        self.demo_lines = demo_lines
-        self.add_demo_line()
+        # Add lines in timed blocks to simulate real-time output
+        self.demo_after_ids = []
+        for delay, block, is_last in self.build_demo_schedule(demo_lines):
+            after_id = self.root.after(delay, self.add_demo_block, block, is_last)
+            self.demo_after_ids.append(after_id)
         
-    def add_demo_line(self):
-        """Add one line of demo output with timing"""
-        if self.demo_line_index < len(self.demo_lines) and self.is_running:
-            line = self.demo_lines[self.demo_line_index]
-            self.output_text.insert(tk.END, line)
-            self.output_text.see(tk.END)
-            self.demo_line_index += 1
-            
-            # Schedule next line (vary timing for realism)
-            delay = 200 if line.startswith("⬇️") else 100
-            if line.startswith("🔄") or line.startswith("📥"):
-                delay = 500
+    @staticmethod
+    def demo_line_delay(line):
+        """Delay in ms before the line following this one (vary timing for realism)"""
+        if line.startswith("🔄") or line.startswith("📥"):
+            return 500
+        return 200 if line.startswith("⬇️") else 100
+        
+    @classmethod
+    def build_demo_schedule(cls, demo_lines):
+        """Group demo lines into (cumulative_delay_ms, text, is_last) blocks
+        
+        Consecutive lines with the short default delay are merged into one
+        block that is shown when its final line would have appeared.
+        """
+        schedule = []
+        block = []
+        elapsed = 0
+        for index, line in enumerate(demo_lines):
+            block.append(line)
+            delay = cls.demo_line_delay(line)
+            if delay > 100 or index == len(demo_lines) - 1:
+                schedule.append((elapsed, "".join(block)))
+                block = []
+            elapsed += delay
+        return [(delay, text, i == len(schedule) - 1)
+                for i, (delay, text) in enumerate(schedule)]
+        
+    def add_demo_block(self, block, is_last):
+        """Add one block of demo output"""
+        if not self.is_running:
+            self.finish_demo()
+            return
+        
+        self.append_output(block)
+        
+        if is_last:
+            self.finish_demo()
             
-            self.root.after(delay, self.add_demo_line)
-        else:
-            # Demo finished
-            self.is_running = False
-            self.update_btn.config(state='normal')
-            self.stop_btn.config(state='disabled')
-            self.progress.stop()
+    def cancel_demo_callbacks(self):
+        """Cancel any demo output blocks that are still scheduled"""
+        for after_id in self.demo_after_ids:
+            self.root.after_cancel(after_id)
+        self.demo_after_ids = []
+        
+    def finish_demo(self):
+        """Reset the UI once the demo finishes or is stopped"""
+        self.cancel_demo_callbacks()
+        
+        self.is_running = False
+        self.update_btn.config(state='normal')
+        self.stop_btn.config(state='disabled')
+        self.progress.stop()
+        
+    def on_close(self):
+        """Cancel pending demo output before closing the window"""
+        self.cancel_demo_callbacks()
+        super().on_close()
 
 def main():
     """Launch the demo GUI"""
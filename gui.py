@@ -8,17 +8,24 @@ Provides an intuitive way to update modpacks and generate .mrpack files.
 Author: LunarBit
 """
 
+# subprocess, filedialog and messagebox are imported on first use to keep start-up fast
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk
+from tkinter import font as tkfont
 import threading
-import queue
+import collections
 import os
+import re
 import sys
-import subprocess
+import codecs
+import contextlib
+import io
 from pathlib import Path
 
-# Add the current directory to path to import the main script
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Directory containing the GUI and the updater script
+SCRIPT_DIR = Path(__file__).resolve().parent
+UPDATER_SCRIPT = SCRIPT_DIR / "update_modpack.py"
+UPDATER_COMMAND = [sys.executable, str(UPDATER_SCRIPT)]
 
 class LunarBitTheme:
     """LunarBit color scheme and styling"""
@@ -41,117 +48,213 @@ class LunarBitTheme:
     BORDER_SUBTLE = "#21262d"       # Subtle borders
     HOVER = "#30363d"               # Hover state
     
-    @classmethod
-    def configure_style(cls):
-        """Configure ttk styles with enhanced LunarBit theme"""
-        style = ttk.Style()
-        
-        # Configure main theme
-        style.theme_use('clam')
-        
-        # Configure colors
-        style.configure('.',
-                       background=cls.BACKGROUND,
-                       foreground=cls.TEXT_PRIMARY,
-                       fieldbackground=cls.SURFACE,
-                       bordercolor=cls.BORDER,
-                       focuscolor=cls.PRIMARY,
-                       selectbackground=cls.PRIMARY,
-                       selectforeground=cls.TEXT_PRIMARY)
+    # ttk style configuration, applied in order by configure_style
+    STYLE_SPEC = (
+        ('.', dict(background=BACKGROUND,
+                   foreground=TEXT_PRIMARY,
+                   fieldbackground=SURFACE,
+                   bordercolor=BORDER,
+                   focuscolor=PRIMARY,
+                   selectbackground=PRIMARY,
+                   selectforeground=TEXT_PRIMARY)),
         
         # Enhanced button styles with gradients
-        style.configure('Accent.TButton',
-                       background=cls.PRIMARY,
-                       foreground=cls.TEXT_PRIMARY,
-                       borderwidth=0,
-                       focuscolor='none',
-                       padding=(25, 12),
-                       font=('Segoe UI', 10, 'bold'))
-        
-        style.map('Accent.TButton',
-                 background=[('active', cls.PRIMARY_VARIANT),
-                           ('pressed', cls.PRIMARY_VARIANT),
-                           ('focus', cls.PRIMARY_LIGHT)])
-        
-        style.configure('Secondary.TButton',
-                       background=cls.SURFACE_VARIANT,
-                       foreground=cls.TEXT_PRIMARY,
-                       borderwidth=1,
-                       bordercolor=cls.BORDER,
-                       focuscolor='none',
-                       padding=(20, 10),
-                       font=('Segoe UI', 9))
-        
-        style.map('Secondary.TButton',
-                 background=[('active', cls.SURFACE_HOVER),
-                           ('pressed', cls.SURFACE_HOVER)],
-                 bordercolor=[('active', cls.PRIMARY),
-                            ('focus', cls.PRIMARY)])
+        ('Accent.TButton', dict(background=PRIMARY,
+                                foreground=TEXT_PRIMARY,
+                                borderwidth=0,
+                                focuscolor='none',
+                                padding=(25, 12),
+                                font=('Segoe UI', 10, 'bold'))),
+        
+        ('Secondary.TButton', dict(background=SURFACE_VARIANT,
+                                   foreground=TEXT_PRIMARY,
+                                   borderwidth=1,
+                                   bordercolor=BORDER,
+                                   focuscolor='none',
+                                   padding=(20, 10),
+                                   font=('Segoe UI', 9))),
         
         # Enhanced frame styles
-        style.configure('Card.TFrame',
-                       background=cls.SURFACE,
-                       borderwidth=1,
-                       relief='solid',
-                       bordercolor=cls.BORDER_SUBTLE)
-        
-        style.configure('HeaderCard.TFrame',
-                       background=cls.SURFACE,
-                       borderwidth=2,
-                       relief='solid',
-                       bordercolor=cls.PRIMARY)
+        ('Card.TFrame', dict(background=SURFACE,
+                             borderwidth=1,
+                             relief='solid',
+                             bordercolor=BORDER_SUBTLE)),
+        
+        ('HeaderCard.TFrame', dict(background=SURFACE,
+                                   borderwidth=2,
+                                   relief='solid',
+                                   bordercolor=PRIMARY)),
         
         # Enhanced label styles
-        style.configure('Heading.TLabel',
-                       background=cls.SURFACE,
-                       foreground=cls.TEXT_PRIMARY,
-                       font=('Segoe UI', 12, 'bold'))
-        
-        style.configure('Title.TLabel',
-                       background=cls.SURFACE,
-                       foreground=cls.TEXT_PRIMARY,
-                       font=('Segoe UI', 16, 'bold'))
-        
-        style.configure('Subheading.TLabel',
-                       background=cls.SURFACE,
-                       foreground=cls.TEXT_SECONDARY,
-                       font=('Segoe UI', 10))
-        
-        style.configure('Subtitle.TLabel',
-                       background=cls.SURFACE,
-                       foreground=cls.TEXT_SECONDARY,
-                       font=('Segoe UI', 11))
+        ('Heading.TLabel', dict(background=SURFACE,
+                                foreground=TEXT_PRIMARY,
+                                font=('Segoe UI', 12, 'bold'))),
+        
+        ('Title.TLabel', dict(background=SURFACE,
+                              foreground=TEXT_PRIMARY,
+                              font=('Segoe UI', 16, 'bold'))),
+        
+        ('Subheading.TLabel', dict(background=SURFACE,
+                                   foreground=TEXT_SECONDARY,
+                                   font=('Segoe UI', 10))),
+        
+        ('Subtitle.TLabel', dict(background=SURFACE,
+                                 foreground=TEXT_SECONDARY,
+                                 font=('Segoe UI', 11))),
         
         # Enhanced entry styles
-        style.configure('TEntry',
-                       fieldbackground=cls.SURFACE_VARIANT,
-                       bordercolor=cls.BORDER,
-                       insertcolor=cls.TEXT_PRIMARY,
-                       borderwidth=2,
-                       relief='solid',
-                       padding=8)
-        
-        style.map('TEntry',
-                 bordercolor=[('focus', cls.PRIMARY),
-                            ('active', cls.PRIMARY)])
+        ('TEntry', dict(fieldbackground=SURFACE_VARIANT,
+                        bordercolor=BORDER,
+                        insertcolor=TEXT_PRIMARY,
+                        borderwidth=2,
+                        relief='solid',
+                        padding=8)),
         
         # Enhanced checkbutton styles
-        style.configure('TCheckbutton',
-                       background=cls.SURFACE,
-                       foreground=cls.TEXT_PRIMARY,
-                       focuscolor='none',
-                       borderwidth=0,
-                       font=('Segoe UI', 10))
+        ('TCheckbutton', dict(background=SURFACE,
+                              foreground=TEXT_PRIMARY,
+                              focuscolor='none',
+                              borderwidth=0,
+                              font=('Segoe UI', 10))),
         
         # Enhanced progressbar styles
-        style.configure('TProgressbar',
-                       background=cls.PRIMARY,
-                       troughcolor=cls.SURFACE_VARIANT,
-                       borderwidth=0,
-                       lightcolor=cls.PRIMARY,
-                       darkcolor=cls.PRIMARY)
+        ('TProgressbar', dict(background=PRIMARY,
+                              troughcolor=SURFACE_VARIANT,
+                              borderwidth=0,
+                              lightcolor=PRIMARY,
+                              darkcolor=PRIMARY)),
+    )
+    
+    # ttk state maps, applied after STYLE_SPEC
+    STYLE_MAP_SPEC = (
+        ('Accent.TButton', dict(background=[('active', PRIMARY_VARIANT),
+                                            ('pressed', PRIMARY_VARIANT),
+                                            ('focus', PRIMARY_LIGHT)])),
+        
+        ('Secondary.TButton', dict(background=[('active', SURFACE_HOVER),
+                                               ('pressed', SURFACE_HOVER)],
+                                   bordercolor=[('active', PRIMARY),
+                                                ('focus', PRIMARY)])),
+        
+        ('TEntry', dict(bordercolor=[('focus', PRIMARY),
+                                     ('active', PRIMARY)])),
+    )
+    
+    _style = None
+    
+    @classmethod
+    def configure_style(cls, master=None):
+        """Configure ttk styles with enhanced LunarBit theme"""
+        # Styles are per Tk interpreter, so only reuse the cached one for the same root
+        if cls._style is not None and cls._style.master is master:
+            return cls._style
+        
+        style = ttk.Style(master)
+        
+        # Configure main theme
+        style.theme_use('clam')
+        
+        configure, style_map = style.configure, style.map
+        for name, options in cls.STYLE_SPEC:
+            configure(name, **options)
+        for name, options in cls.STYLE_MAP_SPEC:
+            style_map(name, **options)
+        
+        cls._style = style
+        return style
 
+class UpdateStopped(BaseException):
+    """Raised inside an in-process update when the user presses Stop
+    
+    Derives from BaseException so the updater's ``except Exception``
+    handlers do not swallow it.
+    """
+
+class OutputWriter(io.TextIOBase):
+    """File-like object that forwards in-process updater output to the GUI
+    
+    Text is batched and posted once OUTPUT_BATCH_LINES lines have been
+    buffered, or OUTPUT_BATCH_INTERVAL seconds after the first of them was
+    written, whichever comes first. The deadline is enforced by a timer so
+    output is not held back while the updater blocks on a lookup or
+    download. The updater's lookup threads write here too, so the buffer is
+    guarded by a lock; the UI is woken only after it is released, since that
+    waits on the Tk main thread, which may itself be writing here while
+    stdout/stderr are redirected. Only the thread that created the writer
+    (the update worker) raises UpdateStopped once the user stops the update.
+    """
+    
+    def __init__(self, gui):
+        super().__init__()
+        self.gui = gui
+        self.buffer = []
+        self.buffered_lines = 0
+        self.flush_timer = None
+        self.lock = threading.Lock()
+        self.owner = threading.get_ident()
+        
+    def writable(self):
+        return True
+        
+    def write(self, text):
+        if self.gui.stop_event.is_set() and threading.get_ident() == self.owner:
+            raise UpdateStopped()
+        if not text:
+            return 0
+        lines = text.count('\n')
+        with self.lock:
+            self.buffer.append(text)
+            self.buffered_lines += lines
+            full = self.buffered_lines >= self.gui.OUTPUT_BATCH_LINES
+            if not full and self.flush_timer is None:
+                # First text since the last flush: post it by the deadline at the latest
+                self.flush_timer = threading.Timer(self.gui.OUTPUT_BATCH_INTERVAL, self.flush)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+        if full:
+            self.flush()
+        return len(text)
+        
+    def flush(self):
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            queued = bool(self.buffer)
+            if queued:
+                # Queue under the lock so batches from different threads stay in order
+                self.gui.output_queue.append("".join(self.buffer))
+                self.buffer.clear()
+            self.buffered_lines = 0
+        if queued:
+            self.gui.wake_ui()
+            
 class ModpackUpdaterGUI:
+    # Output batching: flush the reader buffer every N lines or N seconds
+    OUTPUT_BATCH_LINES = 32
+    OUTPUT_BATCH_INTERVAL = 0.05
+    # Subprocess pipe buffer and per-read chunk size in bytes
+    PIPE_BUFFER_SIZE = 65536
+    PIPE_READ_SIZE = 4096
+    # Maximum number of lines kept in the output log
+    MAX_OUTPUT_LINES = 5000
+    # Call update_modpack.main() in-process; set False to always run it as a subprocess
+    RUN_IN_PROCESS = True
+    
+    # ANSI colour codes written by update_modpack.Colors, mapped to log text tags
+    ANSI_PATTERN = re.compile(r"\033\[([0-9;]*)m")
+    ANSI_TAGS = {'92': ('ok',), '93': ('warn',), '91': ('err',)}
+    
+    # Output keywords that drive the status label; failures match case-insensitively
+    STATUS_PATTERN = re.compile(r"Checking for mod updates|Downloading|Generating|(?i:failed|error)")
+    STATUS_MESSAGES = {
+        'checking for mod updates': ("🔍 Checking for updates...", LunarBitTheme.PRIMARY),
+        'downloading': ("📥 Downloading updates...", LunarBitTheme.PRIMARY),
+        'generating': ("📦 Generating modpack...", LunarBitTheme.PRIMARY),
+        'failed': ("❌ Update failed!", LunarBitTheme.SECONDARY),
+        'error': ("❌ Update failed!", LunarBitTheme.SECONDARY),
+    }
+    
     def __init__(self, root):
         self.root = root
         self.setup_window()
@@ -167,14 +270,17 @@ class ModpackUpdaterGUI:
         
         # Set window icon if available
         try:
-            icon_path = Path(__file__).parent / "icon.png"
+            icon_path = SCRIPT_DIR / "icon.png"
             if icon_path.exists():
                 self.root.iconphoto(True, tk.PhotoImage(file=icon_path))
         except:
             pass
         
+        # Stop any running update before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Configure theme
-        LunarBitTheme.configure_style()
+        LunarBitTheme.configure_style(self.root)
         self.root.configure(bg=LunarBitTheme.BACKGROUND)
         
         # Make window resizable with better proportions
@@ -188,14 +294,50 @@ class ModpackUpdaterGUI:
         self.generate_server = tk.BooleanVar()
         self.overrides_folder = tk.StringVar(value="overrides")
         self.is_running = False
+        self.stop_event = threading.Event()
+        self.process = None
+        self.watched_fd = None
         
     def setup_queue(self):
         """Setup queue for thread communication"""
-        self.output_queue = queue.Queue()
-        self.root.after(100, self.check_queue)
+        # deque append/popleft are atomic, so no lock is needed between threads
+        self.output_queue = collections.deque()
+        # Set while a <<OutputReady>> event is pending, so bursts wake the UI only once
+        self.wakeup_pending = False
+        self.wakeup_lock = threading.Lock()
+        self.root.bind('<<OutputReady>>', self.check_queue)
+        
+    def post_output(self, message):
+        """Queue a message for the UI thread and wake it up if it is not already due to run"""
+        self.output_queue.append(message)
+        self.wake_ui()
+        
+    def wake_ui(self):
+        """Wake the UI thread to drain the output queue, unless a wakeup is already pending"""
+        with self.wakeup_lock:
+            if self.wakeup_pending:
+                return
+            self.wakeup_pending = True
+        try:
+            self.root.event_generate('<<OutputReady>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            # Window has already been destroyed or the main loop has exited
+            pass
+        
+    def setup_fonts(self):
+        """Create the named fonts shared by the widgets"""
+        self.fonts = {
+            'panel': tkfont.Font(root=self.root, family='Segoe UI', size=13, weight='bold'),
+            'section': tkfont.Font(root=self.root, family='Segoe UI', size=11, weight='bold'),
+            'small': tkfont.Font(root=self.root, family='Segoe UI', size=9),
+            'entry': tkfont.Font(root=self.root, family='Consolas', size=10),
+            'log': tkfont.Font(root=self.root, family='Cascadia Code', size=10),  # Use a better monospace font
+        }
         
     def setup_ui(self):
         """Create the user interface"""
+        self.setup_fonts()
+        
         # Main container with padding
         main_container = ttk.Frame(self.root)
         main_container.pack(fill='both', expand=True, padx=20, pady=20)
@@ -217,34 +359,28 @@ class ModpackUpdaterGUI:
         
     def create_header(self, parent):
         """Create the enhanced header section"""
-        header_frame = ttk.Frame(parent, style='HeaderCard.TFrame')
+        # The card's own padding replaces a nested title frame
+        header_frame = ttk.Frame(parent, style='HeaderCard.TFrame', padding=(25, 20))
         header_frame.pack(fill='x', pady=(0, 25))
         
-        # Logo and title area with gradient-like styling
-        title_frame = ttk.Frame(header_frame)
-        title_frame.pack(fill='x', padx=25, pady=20)
-        
         # Title with enhanced styling
-        title_label = ttk.Label(title_frame, 
+        title_label = ttk.Label(header_frame, 
                                text="🚀 LunarBit Modpack Updater",
                                style='Title.TLabel')
         title_label.pack(anchor='w')
         
         # Subtitle with better spacing
-        subtitle_label = ttk.Label(title_frame,
+        subtitle_label = ttk.Label(header_frame,
                                   text="Intelligent Modrinth modpack updating with client/server generation",
                                   style='Subtitle.TLabel')
         subtitle_label.pack(anchor='w', pady=(8, 0))
         
         # Version/status info
-        status_frame = ttk.Frame(title_frame)
-        status_frame.pack(anchor='w', pady=(10, 0))
-        
-        version_label = ttk.Label(status_frame,
+        version_label = ttk.Label(header_frame,
                                  text="v2.0 • Powered by Modrinth API v2",
                                  style='Subheading.TLabel',
-                                 font=('Segoe UI', 9))
-        version_label.pack(side='left')
+                                 font=self.fonts['small'])
+        version_label.pack(anchor='w', pady=(10, 0))
         
     def create_config_panel(self, parent):
         """Create the enhanced configuration panel"""
@@ -253,12 +389,9 @@ class ModpackUpdaterGUI:
         config_frame.pack_propagate(False)
         
         # Panel header with enhanced styling
-        header_frame = ttk.Frame(config_frame)
-        header_frame.pack(fill='x', padx=25, pady=(20, 15))
-        
-        ttk.Label(header_frame, text="⚙️ Configuration", 
+        ttk.Label(config_frame, text="⚙️ Configuration", 
                  style='Heading.TLabel',
-                 font=('Segoe UI', 13, 'bold')).pack(anchor='w')
+                 font=self.fonts['panel']).pack(anchor='w', padx=25, pady=(20, 15))
         
         # Configuration content with better spacing
         content_frame = ttk.Frame(config_frame)
@@ -267,16 +400,12 @@ class ModpackUpdaterGUI:
         # Modpack selection with enhanced styling
         self.create_modpack_selection(content_frame)
         
-        # Separator
-        separator1 = ttk.Frame(content_frame, height=1, style='Card.TFrame')
-        separator1.pack(fill='x', pady=20)
+        ttk.Separator(content_frame, orient='horizontal').pack(fill='x', pady=20)
         
         # Options with better organization
         self.create_options_section(content_frame)
         
-        # Separator
-        separator2 = ttk.Frame(content_frame, height=1, style='Card.TFrame')
-        separator2.pack(fill='x', pady=20)
+        ttk.Separator(content_frame, orient='horizontal').pack(fill='x', pady=20)
         
         # Action buttons with enhanced styling
         self.create_action_buttons(content_frame)
@@ -290,30 +419,35 @@ class ModpackUpdaterGUI:
         
         ttk.Label(section_frame, text="📁 Modpack Location",
                  style='Heading.TLabel',
-                 font=('Segoe UI', 11, 'bold')).pack(anchor='w')
+                 font=self.fonts['section']).pack(anchor='w')
         
         ttk.Label(section_frame, text="Select a modpack folder or .mrpack file to update",
                  style='Subheading.TLabel').pack(anchor='w', pady=(3, 12))
         
-        # Path selection frame with enhanced styling
+        # Path entry with the file and folder browse buttons underneath
         path_frame = ttk.Frame(section_frame)
         path_frame.pack(fill='x', pady=(0, 15))
+        path_frame.columnconfigure((0, 1), weight=1, uniform='browse')
         
         self.path_entry = ttk.Entry(path_frame, textvariable=self.modpack_path,
-                                   font=('Consolas', 10),
+                                   font=self.fonts['entry'],
                                    style='TEntry')
-        self.path_entry.pack(side='left', fill='x', expand=True, padx=(0, 12))
+        self.path_entry.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 10))
         
-        browse_btn = ttk.Button(path_frame, text="📂 Browse",
+        browse_btn = ttk.Button(path_frame, text="📂 Browse...",
                                command=self.browse_modpack,
-                               style='Secondary.TButton',
-                               width=12)
-        browse_btn.pack(side='right')
+                               style='Secondary.TButton')
+        browse_btn.grid(row=1, column=0, sticky='ew', padx=(0, 6))
+        
+        folder_btn = ttk.Button(path_frame, text="📁 Folder...",
+                               command=self.browse_modpack_folder,
+                               style='Secondary.TButton')
+        folder_btn.grid(row=1, column=1, sticky='ew', padx=(6, 0))
         
         # Path status indicator
         self.path_status = ttk.Label(section_frame, text="",
                                     style='Subheading.TLabel',
-                                    font=('Segoe UI', 9))
+                                    font=self.fonts['small'])
         self.path_status.pack(anchor='w')
         
         # Bind to path changes to show status
@@ -345,60 +479,51 @@ class ModpackUpdaterGUI:
         
         ttk.Label(section_frame, text="🎯 Generation Options",
                  style='Heading.TLabel',
-                 font=('Segoe UI', 11, 'bold')).pack(anchor='w')
+                 font=self.fonts['section']).pack(anchor='w')
         
         ttk.Label(section_frame, text="Choose what to generate after updating mods",
                  style='Subheading.TLabel').pack(anchor='w', pady=(3, 15))
         
-        # Checkboxes with enhanced styling and descriptions
+        # Checkboxes with descriptions, one grid row each
         options_container = ttk.Frame(section_frame)
         options_container.pack(fill='x')
         
         # Client option
-        client_frame = ttk.Frame(options_container)
-        client_frame.pack(fill='x', pady=3)
-        
-        client_cb = ttk.Checkbutton(client_frame, 
+        client_cb = ttk.Checkbutton(options_container, 
                                    text="📱 Generate client .mrpack",
                                    variable=self.generate_client,
                                    style='TCheckbutton')
-        client_cb.pack(anchor='w')
+        client_cb.grid(row=0, column=0, sticky='w', pady=(3, 0))
         
-        client_desc = ttk.Label(client_frame,
+        client_desc = ttk.Label(options_container,
                                text="   Include client-side mods and configs",
                                style='Subheading.TLabel',
-                               font=('Segoe UI', 9))
-        client_desc.pack(anchor='w', padx=(20, 0))
+                               font=self.fonts['small'])
+        client_desc.grid(row=1, column=0, sticky='w', padx=(20, 0), pady=(0, 3))
         
         # Server option
-        server_frame = ttk.Frame(options_container)
-        server_frame.pack(fill='x', pady=3)
-        
-        server_cb = ttk.Checkbutton(server_frame,
+        server_cb = ttk.Checkbutton(options_container,
                                    text="🖥️ Generate server .mrpack",
                                    variable=self.generate_server,
                                    style='TCheckbutton')
-        server_cb.pack(anchor='w')
+        server_cb.grid(row=2, column=0, sticky='w', pady=(3, 0))
         
-        server_desc = ttk.Label(server_frame,
+        server_desc = ttk.Label(options_container,
                                text="   Only server-compatible mods and configs",
                                style='Subheading.TLabel',
-                               font=('Segoe UI', 9))
-        server_desc.pack(anchor='w', padx=(20, 0))
+                               font=self.fonts['small'])
+        server_desc.grid(row=3, column=0, sticky='w', padx=(20, 0), pady=(0, 3))
         
         # Overrides folder section
-        overrides_section = ttk.Frame(section_frame)
-        overrides_section.pack(fill='x', pady=(20, 0))
-        
-        ttk.Label(overrides_section, text="📂 Overrides Folder",
+        ttk.Label(section_frame, text="📂 Overrides Folder",
                  style='Heading.TLabel',
-                 font=('Segoe UI', 11, 'bold')).pack(anchor='w')
+                 font=self.fonts['section']).pack(anchor='w', pady=(20, 0))
         
-        ttk.Label(overrides_section, text="Folder containing configs, resource packs, and other files",
+        ttk.Label(section_frame, text="Folder containing configs, resource packs, and other files",
                  style='Subheading.TLabel').pack(anchor='w', pady=(3, 10))
         
-        overrides_entry = ttk.Entry(overrides_section, textvariable=self.overrides_folder,
-                                   font=('Consolas', 10),
+        overrides_entry = ttk.Entry(section_frame, textvariable=self.overrides_folder,
+                                   font=self.fonts['entry'],
                                    style='TEntry')
         overrides_entry.pack(fill='x')
         
@@ -406,75 +531,90 @@ class ModpackUpdaterGUI:
         """Create enhanced action buttons"""
         button_frame = ttk.Frame(parent)
         button_frame.pack(fill='x', pady=(0, 0))
+        button_frame.columnconfigure((0, 1), weight=1, uniform='actions')
         
         # Main update button with enhanced styling
         self.update_btn = ttk.Button(button_frame,
                                     text="🚀 Update Modpack",
                                     command=self.start_update,
                                     style='Accent.TButton')
-        self.update_btn.pack(fill='x', pady=(0, 12))
-        
-        # Secondary buttons frame
-        secondary_frame = ttk.Frame(button_frame)
-        secondary_frame.pack(fill='x')
+        self.update_btn.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 12))
         
         # Stop button
-        self.stop_btn = ttk.Button(secondary_frame,
+        self.stop_btn = ttk.Button(button_frame,
                                   text="⏹️ Stop",
                                   command=self.stop_update,
                                   style='Secondary.TButton',
                                   state='disabled')
-        self.stop_btn.pack(side='left', fill='x', expand=True, padx=(0, 6))
+        self.stop_btn.grid(row=1, column=0, sticky='ew', padx=(0, 6))
         
         # Clear output button
-        clear_btn = ttk.Button(secondary_frame,
+        clear_btn = ttk.Button(button_frame,
                               text="🗑️ Clear Log",
                               command=self.clear_output,
                               style='Secondary.TButton')
-        clear_btn.pack(side='right', fill='x', expand=True, padx=(6, 0))
+        clear_btn.grid(row=1, column=1, sticky='ew', padx=(6, 0))
         
     def create_output_panel(self, parent):
         """Create the enhanced output panel"""
         output_frame = ttk.Frame(parent, style='Card.TFrame')
         
         # Panel header with enhanced styling
-        header_frame = ttk.Frame(output_frame)
-        header_frame.pack(fill='x', padx=25, pady=(20, 15))
-        
-        ttk.Label(header_frame, text="📋 Live Output", 
+        ttk.Label(output_frame, text="📋 Live Output", 
                  style='Heading.TLabel',
-                 font=('Segoe UI', 13, 'bold')).pack(side='left')
-        
-        # Header buttons
-        button_frame = ttk.Frame(header_frame)
-        button_frame.pack(side='right')
+                 font=self.fonts['panel']).pack(anchor='w', padx=25, pady=(20, 15))
         
         # Output text area with enhanced styling
-        output_container = ttk.Frame(output_frame)
+        # Fixed requested sizes with propagation off, so log inserts never
+        # make the enclosing frames re-measure; the packer still stretches them
+        output_container = ttk.Frame(output_frame, width=600, height=480)
         output_container.pack(fill='both', expand=True, padx=25, pady=(0, 20))
+        output_container.pack_propagate(False)
         
         # Create a frame for the text widget with border
         text_border_frame = tk.Frame(output_container, 
                                     bg=LunarBitTheme.BORDER, 
                                     bd=2, 
-                                    relief='solid')
+                                    relief='solid',
+                                    width=600,
+                                    height=400)
         text_border_frame.pack(fill='both', expand=True)
+        text_border_frame.grid_propagate(False)
+        text_border_frame.columnconfigure(0, weight=1)
+        text_border_frame.rowconfigure(0, weight=1)
         
-        self.output_text = scrolledtext.ScrolledText(
+        # No wrapping or undo history, so inserts never re-wrap the whole log
+        self.output_text = tk.Text(
             text_border_frame,
-            wrap=tk.WORD,
+            wrap='none',
+            undo=False,
+            autoseparators=False,
             bg=LunarBitTheme.SURFACE_VARIANT,
             fg=LunarBitTheme.TEXT_PRIMARY,
             insertbackground=LunarBitTheme.TEXT_PRIMARY,
             selectbackground=LunarBitTheme.PRIMARY,
             selectforeground=LunarBitTheme.TEXT_PRIMARY,
-            font=('Cascadia Code', 10),  # Use a better monospace font
+            font=self.fonts['log'],
             borderwidth=0,
             highlightthickness=0,
             padx=15,
             pady=12
         )
-        self.output_text.pack(fill='both', expand=True)
+        self.output_text.configure(state='disabled')
+        self.output_text.tag_configure('ok', foreground=LunarBitTheme.SUCCESS)
+        self.output_text.tag_configure('warn', foreground=LunarBitTheme.WARNING)
+        self.output_text.tag_configure('err', foreground=LunarBitTheme.SECONDARY)
+        self.output_tag = ()
+        self.output_text.grid(row=0, column=0, sticky='nsew')
+        
+        y_scrollbar = ttk.Scrollbar(text_border_frame, orient='vertical',
+                                    command=self.output_text.yview)
+        y_scrollbar.grid(row=0, column=1, sticky='ns')
+        x_scrollbar = ttk.Scrollbar(text_border_frame, orient='horizontal',
+                                    command=self.output_text.xview)
+        x_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.output_text.configure(yscrollcommand=y_scrollbar.set,
+                                   xscrollcommand=x_scrollbar.set)
         
         # Enhanced progress bar
         progress_frame = ttk.Frame(output_container)
@@ -488,105 +628,46 @@ class ModpackUpdaterGUI:
         self.status_label = ttk.Label(progress_frame, 
                                      text="Ready to update modpack",
                                      style='Subheading.TLabel',
-                                     font=('Segoe UI', 9))
+                                     font=self.fonts['small'])
         self.status_label.pack(pady=(8, 0))
+        self.status_state = ("Ready to update modpack", None)
         
         return output_frame
         
-    def browse_modpack(self):
-        """Open file/folder browser for modpack selection with choice dialog"""
+    def browse_initial_dir(self):
+        """Directory the browse dialogs open in"""
         current_path = self.modpack_path.get()
-        initial_dir = os.path.dirname(current_path) if current_path else os.getcwd()
-        
-        # Create a custom dialog to choose between folder or file
-        choice_window = tk.Toplevel(self.root)
-        choice_window.title("Select Modpack Type")
-        choice_window.geometry("400x200")
-        choice_window.configure(bg=LunarBitTheme.BACKGROUND)
-        choice_window.transient(self.root)
-        choice_window.grab_set()
-        
-        # Center the dialog
-        choice_window.geometry("+%d+%d" % (
-            self.root.winfo_rootx() + 250,
-            self.root.winfo_rooty() + 200
-        ))
-        
-        # Configure style for the dialog
-        choice_frame = ttk.Frame(choice_window, style='Card.TFrame')
-        choice_frame.pack(fill='both', expand=True, padx=20, pady=20)
-        
-        # Title
-        title_label = ttk.Label(choice_frame, 
-                               text="Choose Modpack Type",
-                               style='Heading.TLabel',
-                               font=('Segoe UI', 14, 'bold'))
-        title_label.pack(pady=(10, 15))
-        
-        # Description
-        desc_label = ttk.Label(choice_frame,
-                              text="What type of modpack would you like to select?",
-                              style='Subheading.TLabel')
-        desc_label.pack(pady=(0, 20))
-        
-        # Button frame
-        button_frame = ttk.Frame(choice_frame)
-        button_frame.pack(fill='x', pady=(0, 10))
-        
-        result = {'path': ''}
-        
-        def select_folder():
-            choice_window.destroy()
-            folder = filedialog.askdirectory(
-                title="Select Modpack Folder",
-                initialdir=initial_dir
-            )
-            if folder:
-                result['path'] = folder
-                
-        def select_file():
-            choice_window.destroy()
-            file = filedialog.askopenfilename(
-                title="Select .mrpack File",
-                initialdir=initial_dir,
-                filetypes=[("Modrinth Modpack", "*.mrpack"), ("All Files", "*.*")]
-            )
-            if file:
-                result['path'] = file
-                
-        def cancel():
-            choice_window.destroy()
-        
-        # Folder button
-        folder_btn = ttk.Button(button_frame,
-                               text="📁 Modpack Folder",
-                               command=select_folder,
-                               style='Accent.TButton')
-        folder_btn.pack(side='left', expand=True, fill='x', padx=(0, 5))
-        
-        # File button  
-        file_btn = ttk.Button(button_frame,
-                             text="📦 .mrpack File", 
-                             command=select_file,
-                             style='Accent.TButton')
-        file_btn.pack(side='right', expand=True, fill='x', padx=(5, 0))
-        
-        # Cancel button
-        cancel_btn = ttk.Button(choice_frame,
-                               text="Cancel",
-                               command=cancel,
-                               style='Secondary.TButton')
-        cancel_btn.pack(pady=(10, 0))
+        return os.path.dirname(current_path) if current_path else os.getcwd()
         
-        # Wait for dialog to complete
-        choice_window.wait_window()
+    def browse_modpack(self):
+        """Select a .mrpack file, or any file inside a modpack folder to select that folder"""
+        from tkinter import filedialog
+        
+        path = filedialog.askopenfilename(
+            title="Select .mrpack file or any file in modpack folder",
+            initialdir=self.browse_initial_dir(),
+            filetypes=[("Modrinth Modpack", "*.mrpack"), ("All Files", "*.*")]
+        )
+        if path:
+            if not path.endswith('.mrpack'):
+                path = os.path.dirname(path)
+            self.modpack_path.set(path)
+            
+    def browse_modpack_folder(self):
+        """Select a modpack folder"""
+        from tkinter import filedialog
         
-        # Set the selected path
-        if result['path']:
-            self.modpack_path.set(result['path'])
+        path = filedialog.askdirectory(
+            title="Select Modpack Folder",
+            initialdir=self.browse_initial_dir()
+        )
+        if path:
+            self.modpack_path.set(path)
             
     def start_update(self):
         """Start the modpack update process"""
+        from tkinter import messagebox
+        
         if not self.modpack_path.get():
             messagebox.showerror("Error", "Please select a modpack folder or .mrpack file")
             return
@@ -597,115 +678,338 @@ class ModpackUpdaterGUI:
             
         # Update UI state
         self.is_running = True
+        self.stop_event.clear()
         self.update_btn.config(state='disabled')
         self.stop_btn.config(state='normal')
         self.progress.start()
-        self.status_label.config(text="🚀 Starting modpack update...", 
-                                foreground=LunarBitTheme.PRIMARY)
+        self.set_status("🚀 Starting modpack update...", LunarBitTheme.PRIMARY)
         
         # Clear output
-        self.output_text.delete(1.0, tk.END)
-        
-        # Start update in separate thread
-        self.update_thread = threading.Thread(target=self.run_update, daemon=True)
-        self.update_thread.start()
+        self.clear_output()
+        
+        updater = self.load_updater() if self.RUN_IN_PROCESS else None
+        if updater is not None:
+            # Run the updater in-process, skipping interpreter startup
+            self.update_thread = threading.Thread(target=self.run_update_in_process,
+                                                  args=(updater,), daemon=True)
+            self.update_thread.start()
+        elif self.can_watch_process_fd():
+            # Read the child's output directly from Tk's event loop
+            self.watch_update()
+        else:
+            # Start update in separate thread
+            self.update_thread = threading.Thread(target=self.run_update, daemon=True)
+            self.update_thread.start()
+        
+    def can_watch_process_fd(self):
+        """Check whether Tk can watch the updater's stdout pipe (POSIX only)"""
+        return os.name == 'posix' and hasattr(self.root.tk, 'createfilehandler')
+        
+    @staticmethod
+    def load_updater():
+        """Import update_modpack for in-process use, or None to fall back to a subprocess"""
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.append(str(SCRIPT_DIR))
+        try:
+            import update_modpack
+        except ImportError:
+            return None
+        return update_modpack if callable(getattr(update_modpack, 'main', None)) else None
+        
+    def build_args(self):
+        """Build the updater arguments from the current settings"""
+        args = ["--modpack-dir", self.modpack_path.get()]
+        
+        if self.generate_client.get():
+            args.append("--client")
+        if self.generate_server.get():
+            args.append("--server")
+        if self.overrides_folder.get():
+            args.extend(["--overrides-folder", self.overrides_folder.get()])
+        return args
+        
+    def build_command(self, args=None):
+        """Build the updater command line from the current settings or the given arguments"""
+        return UPDATER_COMMAND + (self.build_args() if args is None else args)
+        
+    def start_process(self, cmd):
+        """Start the updater, reading raw bytes so output can be decoded in bulk"""
+        import subprocess
+        
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=self.PIPE_BUFFER_SIZE,
+            env=dict(os.environ, PYTHONIOENCODING='utf-8')
+        )
+        return self.process
+        
+    def output_header(self, cmd):
+        """Build the log header shown before the updater output"""
+        return (f"🚀 Starting modpack update...\n"
+                f"📁 Modpack: {self.modpack_path.get()}\n"
+                f"⚙️ Command: {' '.join(cmd)}\n"
+                f"{'-' * 50}\n\n")
+        
+    @staticmethod
+    def output_decoder():
+        """Incremental decoder for the updater's output bytes
+        
+        Decodes UTF-8 and translates CRLF and lone CR line endings to LF like
+        universal newlines, holding a trailing CR back until the next chunk
+        shows whether an LF follows.
+        """
+        return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')('replace'), translate=True)
+        
+    @staticmethod
+    def completion_message(returncode):
+        """Describe how the updater exited"""
+        if returncode == 0:
+            return "\n✅ Update completed successfully!\n"
+        return f"\n❌ Update failed with exit code {returncode}\n"
+        
+    def run_update_in_process(self, updater):
+        """Run update_modpack.main in this worker thread with its output captured"""
+        writer = OutputWriter(self)
+        try:
+            args = self.build_args()
+            
+            self.post_output(self.output_header(self.build_command(args)))
+            
+            try:
+                with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                    updater.main(args, stop_event=self.stop_event)
+                returncode = 0
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    returncode = e.code or 0
+                else:
+                    writer.write(f"{e.code}\n")
+                    returncode = 1
+            writer.flush()
+            self.post_output(self.completion_message(returncode))
+            
+        except (UpdateStopped, updater.UpdateStopped):
+            pass
+        except Exception as e:
+            writer.flush()
+            self.post_output(f"\n❌ Error: {str(e)}\n")
+        finally:
+            # Post anything still buffered now, rather than from the timer after DONE
+            writer.flush()
+            self.post_output("DONE")
         
     def run_update(self):
         """Run the modpack update in a separate thread"""
         try:
-            # Build command
-            script_path = Path(__file__).parent / "update_modpack.py"
-            cmd = [sys.executable, str(script_path), "--modpack-dir", self.modpack_path.get()]
-            
-            if self.generate_client.get():
-                cmd.append("--client")
-            if self.generate_server.get():
-                cmd.append("--server")
-            if self.overrides_folder.get():
-                cmd.extend(["--overrides-folder", self.overrides_folder.get()])
+            cmd = self.build_command()
                 
-            self.output_queue.put(f"🚀 Starting modpack update...\n")
-            self.output_queue.put(f"📁 Modpack: {self.modpack_path.get()}\n")
-            self.output_queue.put(f"⚙️ Command: {' '.join(cmd)}\n")
-            self.output_queue.put("-" * 50 + "\n\n")
+            self.post_output(self.output_header(cmd))
             
-            # Run the process
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
+            process = self.start_process(cmd)
             
-            # Read output line by line
+            # Read output in chunks and hand complete lines to an OutputWriter, which
+            # batches them and posts them by its deadline even while the child is quiet
             if process.stdout:
-                for line in process.stdout:
-                    if not self.is_running:
-                        process.terminate()
-                        break
-                    self.output_queue.put(line)
+                decoder = self.output_decoder()
+                writer = OutputWriter(self)
+                pending = ""
+                try:
+                    # stop_update() terminates the child, so a blocked read returns promptly
+                    for chunk in iter(lambda: process.stdout.read1(self.PIPE_READ_SIZE), b''):
+                        if self.stop_event.is_set():
+                            process.terminate()
+                            break
+                        text = pending + decoder.decode(chunk)
+                        split = text.rfind('\n') + 1
+                        pending = text[split:]
+                        if split:
+                            writer.write(text[:split])
+                    pending += decoder.decode(b'', final=True)
+                    if pending and not self.stop_event.is_set():
+                        writer.write(pending)
+                finally:
+                    writer.flush()
                 
             # Wait for process to complete
             process.wait()
-            
-            if process.returncode == 0:
-                self.output_queue.put(f"\n✅ Update completed successfully!\n")
-            else:
-                self.output_queue.put(f"\n❌ Update failed with exit code {process.returncode}\n")
+            self.post_output(self.completion_message(process.returncode))
                 
+        except UpdateStopped:
+            # Stopped between reads; stop_update() has already terminated the child,
+            # so just reap it
+            process.wait()
         except Exception as e:
-            self.output_queue.put(f"\n❌ Error: {str(e)}\n")
+            self.post_output(f"\n❌ Error: {str(e)}\n")
         finally:
-            self.output_queue.put("DONE")
+            self.post_output("DONE")
+            
+    def watch_update(self):
+        """Run the modpack update, reading its output from Tk's event loop"""
+        try:
+            cmd = self.build_command()
+            
+            self.append_output(self.output_header(cmd))
+            
+            process = self.start_process(cmd)
+            fd = process.stdout.fileno()
+            os.set_blocking(fd, False)
+            self.stdout_decoder = self.output_decoder()
+            self.stdout_pending = ""
+            self.root.tk.createfilehandler(fd, tk.READABLE, self.on_process_output)
+            self.watched_fd = fd
+        except Exception as e:
+            self.append_output(f"\n❌ Error: {str(e)}\n")
+            self.finish_update()
+            
+    def on_process_output(self, fd, mask):
+        """Tk file handler: append the complete lines the updater has written to its pipe"""
+        process = self.process
+        try:
+            data = os.read(fd, self.PIPE_BUFFER_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        
+        if data and not self.stop_event.is_set():
+            # Only show complete lines; keep a trailing partial line for the next read
+            text = self.stdout_pending + self.stdout_decoder.decode(data)
+            split = text.rfind('\n') + 1
+            self.stdout_pending = text[split:]
+            self.append_output(text[:split])
+            return
+        
+        # EOF or stopped by the user
+        self.unwatch_process_fd()
+        if self.stop_event.is_set():
+            process.terminate()
+        self.append_output(self.stdout_pending + self.stdout_decoder.decode(b'', final=True))
+        process.stdout.close()
+        process.wait()
+        self.append_output(self.completion_message(process.returncode))
+        self.finish_update()
             
+    def unwatch_process_fd(self):
+        """Remove the Tk file handler on the updater's stdout, if one is registered"""
+        if self.watched_fd is not None:
+            self.root.tk.deletefilehandler(self.watched_fd)
+            self.watched_fd = None
+            
+    def on_close(self):
+        """Stop any running update and close the window"""
+        self.is_running = False
+        self.stop_event.set()
+        self.unwatch_process_fd()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        self.root.destroy()
+        
     def stop_update(self):
         """Stop the running update"""
         self.is_running = False
-        self.output_queue.put("\n⏹️ Update stopped by user\n")
-        
-    def check_queue(self):
-        """Check for messages from the update thread"""
+        self.stop_event.set()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        self.post_output("\n⏹️ Update stopped by user\n")
+        
+    def check_queue(self, event=None):
+        """Handle messages posted by the update thread"""
+        # Clear the flag before draining so messages posted from here on schedule a new wakeup
+        with self.wakeup_lock:
+            self.wakeup_pending = False
+        
+        chunks = []
+        done = False
+        # Bind the loop's methods to locals to skip attribute lookups per message
+        get_message = self.output_queue.popleft
+        add_chunk = chunks.append
         try:
             while True:
-                message = self.output_queue.get_nowait()
+                message = get_message()
                 if message == "DONE":
-                    # Update finished
-                    self.is_running = False
-                    self.update_btn.config(state='normal')
-                    self.stop_btn.config(state='disabled')
-                    self.progress.stop()
-                    self.status_label.config(text="✅ Update completed!", 
-                                           foreground=LunarBitTheme.SUCCESS)
-                    break
+                    done = True
                 else:
-                    # Add message to output
-                    self.output_text.insert(tk.END, message)
-                    self.output_text.see(tk.END)
-                    
-                    # Update status based on message content
-                    if "Checking for mod updates" in message:
-                        self.status_label.config(text="🔍 Checking for updates...", 
-                                               foreground=LunarBitTheme.PRIMARY)
-                    elif "Downloading" in message:
-                        self.status_label.config(text="📥 Downloading updates...", 
-                                               foreground=LunarBitTheme.PRIMARY)
-                    elif "Generating" in message:
-                        self.status_label.config(text="📦 Generating modpack...", 
-                                               foreground=LunarBitTheme.PRIMARY)
-                    elif "failed" in message.lower() or "error" in message.lower():
-                        self.status_label.config(text="❌ Update failed!", 
-                                               foreground=LunarBitTheme.SECONDARY)
-        except queue.Empty:
+                    add_chunk(message)
+        except IndexError:
             pass
         
-        # Schedule next check
-        self.root.after(100, self.check_queue)
+        if chunks:
+            self.append_output("".join(chunks))
+        
+        if done:
+            self.finish_update()
+            
+    def append_output(self, text):
+        """Add output to the log in a single insert and update the status label"""
+        if not text:
+            return
+        segments = self.split_ansi(text)
+        if not segments:
+            return
+        # The log is read-only; enable it only for the batched insert and trim
+        self.output_text.configure(state='normal')
+        self.output_text.insert(tk.END, *segments)
+        self.trim_output()
+        self.output_text.configure(state='disabled')
+        self.output_text.see(tk.END)
+        self.update_status("".join(segments[::2]))
+        
+    def split_ansi(self, text):
+        """Split output on ANSI colour codes into alternating text/tag insert arguments
+        
+        The current colour carries over between calls, like on a terminal.
+        """
+        if '\033' not in text:
+            return [text, self.output_tag]
+        
+        segments = []
+        pos = 0
+        for match in self.ANSI_PATTERN.finditer(text):
+            if match.start() > pos:
+                segments += (text[pos:match.start()], self.output_tag)
+            self.output_tag = self.ANSI_TAGS.get(match.group(1), ())
+            pos = match.end()
+        if pos < len(text):
+            segments += (text[pos:], self.output_tag)
+        return segments
+        
+    def finish_update(self):
+        """Reset the UI state once the update has finished"""
+        self.is_running = False
+        self.process = None
+        self.update_btn.config(state='normal')
+        self.stop_btn.config(state='disabled')
+        self.progress.stop()
+        self.set_status("✅ Update completed!", LunarBitTheme.SUCCESS)
+        
+    def trim_output(self):
+        """Drop the oldest output lines once the log exceeds MAX_OUTPUT_LINES"""
+        lines = int(self.output_text.index('end-1c').split('.')[0])
+        if lines > self.MAX_OUTPUT_LINES:
+            self.output_text.delete('1.0', f'{lines - self.MAX_OUTPUT_LINES + 1}.0')
+        
+    def update_status(self, message):
+        """Update the status label from the last status keyword in the output"""
+        match = None
+        for match in self.STATUS_PATTERN.finditer(message):
+            pass
+        if match:
+            self.set_status(*self.STATUS_MESSAGES[match.group(0).lower()])
+            
+    def set_status(self, text, color):
+        """Update the status label, skipping the Tk call when nothing changed"""
+        if (text, color) != self.status_state:
+            self.status_label.config(text=text, foreground=color)
+            self.status_state = (text, color)
         
     def clear_output(self):
         """Clear the output text area"""
+        self.output_text.configure(state='normal')
         self.output_text.delete(1.0, tk.END)
+        self.output_text.configure(state='disabled')
+        self.output_tag = ()
 
 def main():
     """Main entry point for the GUI"""
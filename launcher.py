@@ -14,20 +14,52 @@ Usage:
 
 import sys
 import os
-import argparse
-from pathlib import Path
+import functools
+
+_HELP_TEXT = """\
+🚀 LunarBit Modpack Updater - Universal Launcher
+=======================================================
+
+Usage: python3 launcher.py [--gui | --cli [CLI_OPTIONS] | --help]
+
+Options:
+  --gui        Launch GUI mode explicitly
+  --cli        Launch CLI mode explicitly
+  --help, -h   Show this help message
+
+CLI Mode Options:
+  When using --cli, you can pass any options supported by update_modpack.py
+  Example: python3 launcher.py --cli --modpack-dir ./MyModpack --client
+
+Auto-Detection:
+  If you provide CLI arguments without --cli, CLI mode will be auto-selected
+  Example: python3 launcher.py --modpack-dir ./MyModpack
+"""
+
+# Result of the GUI probe, filled in on first use
+_GUI_SUPPORT = None
 
 def has_gui_support():
     """Check if GUI is supported in the current environment"""
-    try:
-        import tkinter
-        # Test if we can create a Tk instance (may fail in headless environments)
-        root = tkinter.Tk()
-        root.withdraw()  # Hide the test window
-        root.destroy()
-        return True
-    except (ImportError, Exception):
-        return False
+    global _GUI_SUPPORT
+    if _GUI_SUPPORT is not None:
+        return _GUI_SUPPORT
+    
+    if os.environ.get('MODPACK_UPDATER_NO_GUI'):
+        # GUI explicitly disabled by the user
+        _GUI_SUPPORT = False
+    elif (os.name == 'posix' and sys.platform != 'darwin'
+            and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))):
+        # Headless X11/Wayland system (SSH session, CI, server)
+        _GUI_SUPPORT = False
+    else:
+        # Only look tkinter and its C extension up; they are loaded when
+        # gui.py is imported. Any failure to actually open a window is left
+        # to launch_gui(), which falls back to CLI mode
+        from importlib.util import find_spec
+        _GUI_SUPPORT = (find_spec('tkinter') is not None
+                        and find_spec('_tkinter') is not None)
+    return _GUI_SUPPORT
 
 def show_mode_selection():
     """Show a simple console-based mode selection"""
@@ -54,97 +86,89 @@ def show_mode_selection():
         except (KeyboardInterrupt, EOFError):
             return "cancel"
 
+def _fail_safe(mode, module_file, action):
+    """Report import/runtime errors of a launch function and return success"""
+    def decorator(launch):
+        @functools.wraps(launch)
+        def wrapper(*args):
+            try:
+                launch(*args)
+            except ImportError as e:
+                print(f"❌ Error importing {mode} module: {e}")
+                print(f"Please ensure {module_file} is available in the same directory.")
+                return False
+            except Exception as e:
+                print(f"❌ Error {action} {mode}: {e}")
+                return False
+            return True
+        return wrapper
+    return decorator
+
+@_fail_safe('GUI', 'gui.py', 'starting')
 def launch_gui():
     """Launch the GUI version"""
+    from gui import main as gui_main
+    print("🎨 Launching GUI mode...")
+    gui_main()
+
+def _run_update_modpack(argv):
+    """Run update_modpack.main() as if it had been invoked with argv"""
+    import update_modpack
+    
+    # Prepare sys.argv for the CLI script in place, keeping only the
+    # slots we overwrite
+    saved_prog, saved_args = sys.argv[0], sys.argv[1:]
+    sys.argv[0] = 'update_modpack.py'
+    sys.argv[1:] = argv
     try:
-        from gui import main as gui_main
-        print("🎨 Launching GUI mode...")
-        gui_main()
-    except ImportError as e:
-        print(f"❌ Error importing GUI module: {e}")
-        print("Please ensure gui.py is available in the same directory.")
-        return False
-    except Exception as e:
-        print(f"❌ Error starting GUI: {e}")
-        return False
-    return True
+        update_modpack.main()
+    finally:
+        # Restore original argv
+        sys.argv[0] = saved_prog
+        sys.argv[1:] = saved_args
 
+@_fail_safe('CLI', 'update_modpack.py', 'running')
 def launch_cli(args):
     """Launch the CLI version with given arguments"""
-    try:
-        # Import and run the CLI script
-        import update_modpack
-        
-        # Prepare sys.argv for the CLI script
-        original_argv = sys.argv.copy()
-        sys.argv = ['update_modpack.py'] + args
-        
-        print("💻 Launching CLI mode...")
-        print(f"🔧 Arguments: {' '.join(args)}")
-        print("-" * 50)
-        
-        try:
-            update_modpack.main()
-        finally:
-            # Restore original argv
-            sys.argv = original_argv
-            
-    except ImportError as e:
-        print(f"❌ Error importing CLI module: {e}")
-        print("Please ensure update_modpack.py is available in the same directory.")
-        return False
-    except Exception as e:
-        print(f"❌ Error running CLI: {e}")
-        return False
-    return True
+    print("💻 Launching CLI mode...")
+    print(f"🔧 Arguments: {' '.join(args)}")
+    print("-" * 50)
+    
+    _run_update_modpack(args)
 
 def main():
     """Main launcher function"""
-    # Set up argument parser
-    parser = argparse.ArgumentParser(
-        description="LunarBit Modpack Updater - Universal Launcher",
-        add_help=False  # We'll handle help ourselves
-    )
-    
-    # Add our launcher-specific arguments
-    parser.add_argument('--gui', action='store_true', 
-                       help='Launch GUI mode explicitly')
-    parser.add_argument('--cli', action='store_true',
-                       help='Launch CLI mode explicitly')
-    parser.add_argument('--help', '-h', action='store_true',
-                       help='Show this help message')
-    
-    # Parse known args to separate launcher args from CLI args
-    launcher_args, cli_args = parser.parse_known_args()
+    # Separate launcher flags from the arguments forwarded to the CLI;
+    # --help only belongs to the launcher if it comes before any CLI args
+    gui_flag = cli_flag = help_flag = False
+    cli_args = []
+    for arg in sys.argv[1:]:
+        if arg == '--gui':
+            gui_flag = True
+        elif arg == '--cli':
+            cli_flag = True
+        elif arg in ('--help', '-h') and not cli_args:
+            help_flag = True
+        else:
+            cli_args.append(arg)
     
     # Show help
-    if launcher_args.help:
-        print("🚀 LunarBit Modpack Updater - Universal Launcher")
-        print("=" * 55)
-        print()
-        parser.print_help()
-        print()
-        print("CLI Mode Options:")
-        print("  When using --cli, you can pass any options supported by update_modpack.py")
-        print("  Example: python3 launcher.py --cli --modpack-dir ./MyModpack --client")
-        print()
-        print("Auto-Detection:")
-        print("  If you provide CLI arguments without --cli, CLI mode will be auto-selected")
-        print("  Example: python3 launcher.py --modpack-dir ./MyModpack")
+    if help_flag:
+        sys.stdout.write(_HELP_TEXT)
         return
     
     # Determine mode
     mode = None
     
-    if launcher_args.gui:
+    if gui_flag:
         mode = "gui"
-    elif launcher_args.cli or cli_args:
+    elif cli_flag or cli_args:
         mode = "cli"
     else:
         # No explicit mode specified, try to determine automatically
         if has_gui_support():
             # GUI is available, let user choose or default to GUI
-            if sys.stdin.isatty():  # Interactive terminal
+            if os.isatty(0):  # Interactive terminal (False if stdin is closed)
                 mode = show_mode_selection()
                 if mode == "cancel":
                     print("👋 Goodbye!")
@@ -176,15 +200,9 @@ def main():
             print("📖 Showing CLI help:")
             print()
             try:
-                import update_modpack
-                original_argv = sys.argv.copy()
-                sys.argv = ['update_modpack.py', '--help']
-                try:
-                    update_modpack.main()
-                except SystemExit:
-                    pass  # Normal exit from argparse help
-                finally:
-                    sys.argv = original_argv
+                _run_update_modpack(['--help'])
+            except SystemExit:
+                pass  # Normal exit from argparse help
             except ImportError:
                 print("❌ CLI module not available")
         else:
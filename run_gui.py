@@ -7,13 +7,14 @@ Quick launcher for the GUI version of the modpack updater.
 
 import sys
 import os
-from pathlib import Path
 
 def main():
     """Launch the GUI"""
-    # Add current directory to path
-    current_dir = Path(__file__).parent
-    sys.path.insert(0, str(current_dir))
+    # Add current directory to path, unless it is already there (e.g. as
+    # sys.path[0] when run as a script)
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
     
     try:
         from gui import main as gui_main
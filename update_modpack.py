@@ -12,15 +12,24 @@ Author: Lunarbit
 import os
 import sys
 import json
+import re
 import argparse
-import requests
-import shutil
-import zipfile
-import tempfile
-import hashlib
+import functools
+import threading
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
-from urllib.request import urlopen
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
+
+# requests, zipfile, hashlib and concurrent.futures are imported where they are
+# used, so that `--help` and argument errors return without loading them
+if TYPE_CHECKING:
+    import requests
+
+try:
+    # Optional: faster JSON parsing and serialization
+    import orjson
+except ImportError:
+    orjson = None
 
 # Terminal color codes
 class Colors:
@@ -30,195 +39,432 @@ class Colors:
     RESET = '\033[0m'
 
 MODRINTH_API = "https://api.modrinth.com/v2"
+# Project ID in a Modrinth CDN download URL
+CDN_PROJECT_ID_PATTERN = re.compile(r'cdn\.modrinth\.com/data/([^/?#]+)')
+
+# How many directories below the modpack folder to search for its index
+INDEX_SEARCH_DEPTH = 3
+
+# Number of mods looked up on Modrinth concurrently
+LOOKUP_WORKERS = 8
+# Number of mod files downloaded concurrently
+DOWNLOAD_WORKERS = 8
+# Seconds to wait for a download connection or its next chunk
+DOWNLOAD_TIMEOUT = 30
+# How often main() checks its stop event while waiting for a lookup or download
+STOP_POLL_INTERVAL = 0.1
+
+class UpdateStopped(BaseException):
+    """Raised by main() when its stop event is set, e.g. by the GUI's Stop button"""
+
+# zlib level for .mrpack entries; level 1 is far faster and nearly as small for JSON/configs
+MRPACK_COMPRESSLEVEL = 1
+# Override files that are already compressed and are stored as-is
+STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.ogg', '.zip', '.jar')
+
+def create_session() -> 'requests.Session':
+    """
+    Create the HTTP session shared by all Modrinth API and CDN requests.
+    Connections are pooled and reused across mods; rate-limited and transient
+    server errors are retried with backoff. If requests-cache is installed, API
+    responses are also cached in the user cache directory: version lists are
+    always revalidated, project info is reused for an hour and hash lookups
+    for a day. Downloads are never cached.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+    try:
+        # Optional: caches Modrinth API responses on disk between runs
+        import requests_cache
+    except ImportError:
+        requests_cache = None
+
+    if requests_cache:
+        api = MODRINTH_API.split('://', 1)[-1]
+        session = requests_cache.CachedSession(
+            'modrinth-updater',
+            backend='sqlite',
+            use_cache_dir=True,
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={
+                f"{api}/project/*/version": requests_cache.EXPIRE_IMMEDIATELY,
+                f"{api}/version_file": 86400,
+                f"{api}/project": 3600,
+            },
+            allowable_methods=('GET', 'POST'),
+            cache_control=True,
+            stale_if_error=True,
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({
+        "User-Agent": "LunarBit-ModrinthUpdater/1.0",
+        "Accept-Encoding": "gzip",
+    })
+    session.mount("https://", HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"GET", "POST"}),  # our POSTs are read-only lookups
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the last response back to the caller
+        ),
+    ))
+    return session
+
+@functools.lru_cache(maxsize=None)
+def get_session() -> 'requests.Session':
+    """Return the shared HTTP session, creating it on first use"""
+    return create_session()
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson if available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps_pretty(obj: Any) -> bytes:
+    """Serialize obj as UTF-8 JSON indented by 2 spaces, with orjson if available"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
 
 # -------------------- Argument Parsing --------------------
-def parse_args():
+def parse_args(argv: List[str] | None = None):
     parser = argparse.ArgumentParser(description="Update a Modrinth modpack's mods to latest compatible versions.")
     parser.add_argument('--modpack-dir', required=True, help='Path to modpack folder or .mrpack file')
     parser.add_argument('--client', action='store_true', help='Generate client .mrpack file')
     parser.add_argument('--server', action='store_true', help='Generate server .mrpack file')
     parser.add_argument('--overrides-folder', default='overrides', help='Folder containing config/resource files to include (default: overrides)')
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 # -------------------- Modpack Loading --------------------
-def extract_mrpack(mrpack_path: str) -> str:
-    temp_dir = tempfile.mkdtemp(prefix="modrinth_modpack_")
-    with zipfile.ZipFile(mrpack_path, 'r') as zip_ref:
-        zip_ref.extractall(temp_dir)
-    return temp_dir
+def find_index_in_mrpack(names: List[str]) -> str:
+    # Same precedence as find_index_json(), applied to the archive's member names
+    candidates = []
+    for name in names:
+        directory, _, filename = name.rpartition('/')
+        if filename in ('modrinth.index.json', 'index.json'):
+            depth = directory.count('/') + 1 if directory else 0
+            if depth <= INDEX_SEARCH_DEPTH:
+                candidates.append((depth > 0, filename != 'modrinth.index.json', depth, name))
+    if not candidates:
+        raise FileNotFoundError('modrinth.index.json or index.json not found in .mrpack file')
+    return min(candidates)[-1]
 
 def find_index_json(modpack_dir: str) -> str:
-    # Try both possible filenames for Modrinth modpack index
-    for filename in ['modrinth.index.json', 'index.json']:
-        index_path = os.path.join(modpack_dir, filename)
-        if os.path.exists(index_path):
-            return index_path
-    
-    # If not found in root, search recursively
-    for filename in ['modrinth.index.json', 'index.json']:
-        for root, _, files in os.walk(modpack_dir):
-            if filename in files:
-                return os.path.join(root, filename)
+    # Search breadth-first for the Modrinth modpack index, at most
+    # INDEX_SEARCH_DEPTH directories deep. An index in the root wins; below it,
+    # modrinth.index.json is preferred over a plain index.json anywhere
+    fallback = None
+    pending = deque([(modpack_dir, 0)])
+    while pending:
+        current_dir, depth = pending.popleft()
+        try:
+            with os.scandir(current_dir) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        files = {entry.name: entry.path for entry in entries if entry.is_file()}
+        if 'modrinth.index.json' in files:
+            return files['modrinth.index.json']
+        if 'index.json' in files:
+            if depth == 0:
+                return files['index.json']
+            fallback = fallback or files['index.json']
+        
+        if depth < INDEX_SEARCH_DEPTH:
+            pending.extend((entry.path, depth + 1) for entry in entries if entry.is_dir())
     
+    if fallback:
+        return fallback
     raise FileNotFoundError(f'modrinth.index.json or index.json not found in modpack directory: {modpack_dir}')
 
 def extract_project_id_from_url(download_url: str) -> str | None:
     """Extract project ID from Modrinth download URL"""
     # URL format: https://cdn.modrinth.com/data/{project_id}/versions/{version_id}/{filename}
+    match = CDN_PROJECT_ID_PATTERN.search(download_url)
+    return match.group(1) if match else None
+
+def get_version_info_by_hash(sha1_hash: str) -> Dict[str, Any] | None:
+    """Get version info from Modrinth using file hash"""
+    url = f"{MODRINTH_API}/version_file/{sha1_hash}"
     try:
-        parts = download_url.split('/')
-        if 'cdn.modrinth.com' in download_url and 'data' in parts:
-            data_index = parts.index('data')
-            if data_index + 1 < len(parts):
-                return parts[data_index + 1]
+        resp = get_session().get(url)
+        if resp.status_code == 200:
+            return json_loads(resp.content)
+    except Exception:
+        pass
+    return None
+def get_versions_by_hashes(sha1_hashes: List[str]) -> Dict[str, Dict[str, Any]] | None:
+    """Get version info for many file hashes in one request, keyed by hash"""
+    url = f"{MODRINTH_API}/version_files"
+    try:
+        resp = get_session().post(url, json={"hashes": sha1_hashes, "algorithm": "sha1"})
+        if resp.status_code == 200:
+            return json_loads(resp.content)
     except Exception:
         pass
     return None
 
-def get_version_info_by_hash(sha1_hash: str) -> Dict[str, Any] | None:
-    """Get version info from Modrinth using file hash"""
-    url = f"{MODRINTH_API}/version_file/{sha1_hash}"
+def get_projects_info(project_ids: List[str]) -> Dict[str, Dict[str, Any]] | None:
+    """Get many projects in one request, keyed by both project ID and slug"""
+    url = f"{MODRINTH_API}/projects"
     try:
-        resp = requests.get(url)
+        resp = get_session().get(url, params={"ids": json.dumps(project_ids)})
         if resp.status_code == 200:
-            return resp.json()
+            projects = {}
+            for project in json_loads(resp.content):
+                projects[project.get('id')] = project
+                projects[project.get('slug')] = project
+            return projects
     except Exception:
         pass
     return None
+
+@functools.lru_cache(maxsize=None)
 def get_project_info(slug: str) -> Dict[str, Any] | None:
+    """Get project info from Modrinth; cached per run, callers must not modify the result"""
     url = f"{MODRINTH_API}/project/{slug}"
-    resp = requests.get(url)
+    resp = get_session().get(url)
     if resp.status_code == 200:
-        return resp.json()
+        return json_loads(resp.content)
     return None
 
-def get_latest_version(slug: str, mc_version: str, loaders: List[str], current_version: str, current_version_info: Dict[str, Any] | None = None) -> Tuple[Dict[str, Any] | None, bool]:
+def get_latest_version(slug: str, mc_version: str, loaders: List[str], current_version: str, current_version_info: Dict[str, Any] | None = None,
+                       compatible_loaders: set | None = None, messages: List[str] | None = None) -> Tuple[Dict[str, Any] | None, bool]:
+    """
+    Find the newest version of slug compatible with the modpack and whether it
+    differs from current_version. Progress messages are appended to messages
+    if given (so lookup threads can leave the printing to main), else printed.
+    """
     url = f"{MODRINTH_API}/project/{slug}/version"
     params = {
         "game_versions": mc_version,
         "loaders": loaders
     }
     try:
-        resp = requests.get(url, params=params)
+        resp = get_session().get(url, params=params)
         if resp.status_code != 200:
             return None, False
-        versions = resp.json()
+        versions = json_loads(resp.content)
         if not versions:
             return None, False
+        
+        # Lowercase each version's loaders once, for the checks below
+        for v in versions:
+            v['_loaders_lc'] = frozenset(l.lower() for l in v.get('loaders', []))
             
-        # Get compatible loaders for this modpack
-        compatible_loaders = get_compatible_loaders(loaders)
+        # Get compatible loaders for this modpack, unless the caller already has them
+        if compatible_loaders is None:
+            compatible_loaders = get_compatible_loaders(loaders)
         
         # Sort by date_published descending (newest first)
         versions.sort(key=lambda v: v.get('date_published', ''), reverse=True)
         
-        # Filter versions to only compatible ones
-        compatible_versions = []
-        for v in versions:
-            if is_version_compatible(v, mc_version, compatible_loaders):
-                compatible_versions.append(v)
-        
-        if not compatible_versions:
-            return None, False
-            
         # For Quilt modpacks, prefer Quilt versions over Fabric when available
-        is_quilt_modpack = any('quilt' in loader.lower() for loader in loaders)
+        is_quilt_modpack = 'quilt' in compatible_loaders
         if is_quilt_modpack:
-            quilt_versions = [v for v in compatible_versions if 'quilt' in [l.lower() for l in v.get('loaders', [])]]
-            fabric_versions = [v for v in compatible_versions if 'fabric' in [l.lower() for l in v.get('loaders', [])] and 'quilt' not in [l.lower() for l in v.get('loaders', [])]]
+            # Filter versions to only compatible ones
+            compatible_versions = [v for v in versions if is_version_compatible(v, mc_version, compatible_loaders)]
+            if not compatible_versions:
+                return None, False
+            
+            quilt_versions = [v for v in compatible_versions if 'quilt' in v['_loaders_lc']]
             
             # Check if current mod is Fabric and we have a Quilt alternative
-            current_is_fabric_only = (current_version_info and 
-                                    'fabric' in [l.lower() for l in current_version_info.get('loaders', [])] and 
-                                    'quilt' not in [l.lower() for l in current_version_info.get('loaders', [])])
+            current_loaders = {l.lower() for l in current_version_info.get('loaders', [])} if current_version_info else set()
+            current_is_fabric_only = 'fabric' in current_loaders and 'quilt' not in current_loaders
             
             if current_is_fabric_only and quilt_versions:
                 # Look for a Quilt version of the same version number
                 quilt_same_version = next((v for v in quilt_versions if v['version_number'] == current_version), None)
                 if quilt_same_version:
-                    print(f"    Found Quilt version of same release: {quilt_same_version['version_number']}")
+                    message = f"    Found Quilt version of same release: {quilt_same_version['version_number']}"
+                    if messages is None:
+                        print(message)
+                    else:
+                        messages.append(message)
                     return quilt_same_version, True
             
             # Use Quilt versions if they're as recent as the latest overall version
             if quilt_versions and quilt_versions[0]['date_published'] >= compatible_versions[0]['date_published']:
-                versions_to_check = quilt_versions
+                latest = quilt_versions[0]
             else:
-                versions_to_check = compatible_versions
+                latest = compatible_versions[0]
         else:
-            versions_to_check = compatible_versions
-            
-        # If current_version is empty, return the latest compatible version
-        if not current_version:
-            return versions_to_check[0], True
+            # Versions are newest first, so stop at the first compatible one
+            latest = next((v for v in versions if is_version_compatible(v, mc_version, compatible_loaders)), None)
+            if latest is None:
+                return None, False
             
-        # Find the current version in the compatible list to get its position
-        current_version_index = None
-        for i, v in enumerate(versions_to_check):
-            if v['version_number'] == current_version:
-                current_version_index = i
-                break
-                
-        # If current version is found and there are versions before it (newer), return the first one
-        if current_version_index is not None and current_version_index > 0:
-            newer_version = versions_to_check[0]
-            return newer_version, True
-        elif current_version_index == 0:
-            # Current version is already the latest compatible
-            return versions_to_check[0], False
-        else:
-            # Current version not found in compatible versions, return latest
-            return versions_to_check[0] if versions_to_check else None, bool(versions_to_check)
+        # The latest compatible version is newer unless it is the current one
+        # (an empty current_version always takes the latest)
+        return latest, not current_version or latest['version_number'] != current_version
     except Exception:
         return None, False
 
-def download_file(url: str, dest: str) -> bool:
+def download_file(url: str, dest: str, cancel: threading.Event | None = None) -> Tuple[bool, str | None]:
+    """
+    Download url to dest; returns (success, SHA-1 of the downloaded file).
+    Setting cancel stops the download at the next chunk, like a failure.
+    """
+    import hashlib
     try:
-        with requests.get(url, stream=True) as r:
+        h = hashlib.sha1()
+        with get_session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
             r.raise_for_status()
             with open(dest, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+                for chunk in r.iter_content(chunk_size=65536):
+                    if cancel is not None and cancel.is_set():
+                        raise InterruptedError("Download cancelled")
                     f.write(chunk)
-        return True
+                    h.update(chunk)
+        return True, h.hexdigest()
     except Exception:
-        return False
+        # Don't leave a partial file behind
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        return False, None
+
+def sha1_file(path: str) -> str:
+    """SHA-1 hex digest of a file, read in chunks rather than loaded whole"""
+    import hashlib
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha1').hexdigest()
+        h = hashlib.sha1()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(view[:n])
+        return h.hexdigest()
+
+def wait_for_result(future, stop_event: threading.Event | None = None):
+    """Return future's result, raising UpdateStopped if stop_event is set while waiting"""
+    import concurrent.futures
+    if stop_event is None:
+        return future.result()
+    while not stop_event.is_set():
+        try:
+            return future.result(timeout=STOP_POLL_INTERVAL)
+        except concurrent.futures.TimeoutError:
+            pass
+    raise UpdateStopped()
+
+def get_mod_project_id(mod: Dict[str, Any], version_info: Dict[str, Any] | None) -> str | None:
+    """Project ID of a modpack file entry, from its version info or else its download URL"""
+    if version_info:
+        return version_info.get('project_id')
+    downloads = mod.get('downloads', [])
+    return extract_project_id_from_url(downloads[0]) if downloads else None
+
+def prefetch_mods(mods: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]] | None, Dict[str, Dict[str, Any]] | None]:
+    """
+    Look up the version info and projects of all mods with two bulk requests.
+    Returns (versions_by_hash, projects); either is None if its request failed.
+    """
+    sha1_hashes = [h for h in (mod.get('hashes', {}).get('sha1') for mod in mods) if h]
+    versions_by_hash = get_versions_by_hashes(sha1_hashes) if sha1_hashes else {}
+    
+    project_ids = set()
+    for mod in mods:
+        sha1_hash = mod.get('hashes', {}).get('sha1')
+        version_info = versions_by_hash.get(sha1_hash) if versions_by_hash and sha1_hash else None
+        project_id = get_mod_project_id(mod, version_info)
+        if project_id:
+            project_ids.add(project_id)
+    projects = get_projects_info(sorted(project_ids)) if project_ids else {}
+    
+    return versions_by_hash, projects
+
+def lookup_mod(mod: Dict[str, Any], mc_version: str, loaders: List[str],
+               versions_by_hash: Dict[str, Dict[str, Any]] | None = None,
+               projects: Dict[str, Dict[str, Any]] | None = None,
+               compatible_loaders: set | None = None) -> Tuple[str | None, Dict[str, Any] | None, Dict[str, Any] | None, Dict[str, Any] | None, bool, List[str]]:
+    """
+    Resolve a modpack file entry on Modrinth.
+    Uses the prefetch_mods() results when given, falling back to single lookups.
+    Returns (project_id, version_info, project, latest, is_newer, messages);
+    lookups stop at the first missing piece, leaving the remaining fields empty.
+    This runs on lookup threads, so progress messages are returned for the
+    caller to print in modpack order rather than printed here.
+    """
+    messages = []
+    sha1_hash = mod.get('hashes', {}).get('sha1')
+    
+    # Get version info by hash; the project ID comes from it, or else from the download URL
+    version_info = None
+    if sha1_hash:
+        if versions_by_hash is not None:
+            version_info = versions_by_hash.get(sha1_hash)
+        else:
+            version_info = get_version_info_by_hash(sha1_hash)
+    project_id = get_mod_project_id(mod, version_info)
+    
+    if not project_id:
+        return None, version_info, None, None, False, messages
+    
+    # A project missing from the bulk result may just be keyed differently, so look it up directly
+    project = projects.get(project_id) if projects else None
+    if not project:
+        project = get_project_info(project_id)
+    if not project:
+        return project_id, version_info, None, None, False, messages
+    
+    current_version = version_info.get('version_number', 'unknown') if version_info else 'unknown'
+    latest, is_newer = get_latest_version(project_id, mc_version, loaders, current_version, version_info,
+                                          compatible_loaders, messages)
+    return project_id, version_info, project, latest, is_newer, messages
 
 # -------------------- Mod Updating Logic --------------------
-def backup_and_replace_mod(mods_dir: str, old_filename: str, new_jar_path: str):
+def download_path(mods_dir: str, filename: str) -> str:
+    """
+    Where a mod is downloaded before being moved into place: inside mods_dir so
+    the final move is a same-filesystem rename, and hidden without a .jar
+    suffix so loaders never pick up a partial file.
+    """
+    return os.path.join(mods_dir, f".{filename}.part")
+
+def backup_and_replace_mod(mods_dir: str, old_filename: str, new_jar_path: str, new_filename: str | None = None):
     old_path = os.path.join(mods_dir, old_filename)
     backup_dir = os.path.join(mods_dir, 'old_mods')
     os.makedirs(backup_dir, exist_ok=True)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_name = f"{os.path.splitext(old_filename)[0]}_{timestamp}.jar"
     backup_path = os.path.join(backup_dir, backup_name)
-    shutil.move(old_path, backup_path)
-    shutil.move(new_jar_path, os.path.join(mods_dir, os.path.basename(new_jar_path)))
+    # Both paths are inside mods_dir, so these are plain renames
+    os.replace(old_path, backup_path)
+    os.replace(new_jar_path, os.path.join(mods_dir, new_filename or os.path.basename(new_jar_path)))
 
 # -------------------- Changelog Output --------------------
 def write_changelog(changelog_path: str, updated: List[Dict], uptodate: List[Dict], missing: List[Dict], errors: List[str]):
     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # Build the whole document first and write it in one go
+    parts = ["# Modpack Update Changelog\n\n", f"**Update Time:** {now}\n\n"]
+    if updated:
+        parts.append("## ✅ Updated Mods\n")
+        parts.extend(f"- **{mod['name']}** ({mod['slug']}) {mod['old_version']} → {mod['new_version']}\n" for mod in updated)
+        parts.append("\n")
+    if uptodate:
+        parts.append("## 🟡 Already Up-to-date\n")
+        parts.extend(f"- **{mod['name']}** ({mod['slug']}) {mod['version']}\n" for mod in uptodate)
+        parts.append("\n")
+    if missing:
+        parts.append("## ❌ Missing/Unavailable Mods\n")
+        parts.extend(f"- **{mod['slug']}** (not found on Modrinth)\n" for mod in missing)
+        parts.append("\n")
+    if errors:
+        parts.append("## ⚠️ Errors\n")
+        parts.extend(f"- {err}\n" for err in errors)
+        parts.append("\n")
     with open(changelog_path, 'w', encoding='utf-8') as f:
-        f.write(f"# Modpack Update Changelog\n\n")
-        f.write(f"**Update Time:** {now}\n\n")
-        if updated:
-            f.write("## ✅ Updated Mods\n")
-            for mod in updated:
-                f.write(f"- **{mod['name']}** ({mod['slug']}) {mod['old_version']} → {mod['new_version']}\n")
-            f.write("\n")
-        if uptodate:
-            f.write("## 🟡 Already Up-to-date\n")
-            for mod in uptodate:
-                f.write(f"- **{mod['name']}** ({mod['slug']}) {mod['version']}\n")
-            f.write("\n")
-        if missing:
-            f.write("## ❌ Missing/Unavailable Mods\n")
-            for mod in missing:
-                f.write(f"- **{mod['slug']}** (not found on Modrinth)\n")
-            f.write("\n")
-        if errors:
-            f.write("## ⚠️ Errors\n")
-            for err in errors:
-                f.write(f"- {err}\n")
-            f.write("\n")
+        f.write("".join(parts))
 
 def get_compatible_loaders(modpack_loaders: List[str]) -> set:
     """
@@ -251,25 +497,25 @@ def is_version_compatible(mod_version: Dict[str, Any], target_mc_version: str, c
     """
     Check if a mod version is compatible with the target Minecraft version and modloaders.
     """
+    # Check modloader compatibility first; get_latest_version precomputes the lowercased set
+    version_loaders = mod_version.get('_loaders_lc')
+    if version_loaders is None:
+        version_loaders = frozenset(loader.lower() for loader in mod_version.get('loaders', []))
+    if version_loaders.isdisjoint(compatible_loaders):
+        return False
+
     # Check Minecraft version compatibility
-    version_mc_versions = mod_version.get('game_versions', [])
-    is_mc_compatible = any(
-        is_minecraft_version_compatible(target_mc_version, v_mc_version) 
-        for v_mc_version in version_mc_versions
+    return any(
+        is_minecraft_version_compatible(target_mc_version, v_mc_version)
+        for v_mc_version in mod_version.get('game_versions', ())
     )
-    
-    if not is_mc_compatible:
-        return False
-    
-    # Check modloader compatibility
-    version_loaders = set(loader.lower() for loader in mod_version.get('loaders', []))
-    has_compatible_loader = bool(version_loaders.intersection(compatible_loaders))
-    
-    return has_compatible_loader
+
+@functools.lru_cache(maxsize=4096)
 def is_minecraft_version_compatible(target_version: str, available_version: str) -> bool:
     """
     Check if a Minecraft version is compatible with the target version.
     For example, 1.21.5 mods should work in 1.21.7 modpacks (same major.minor version).
+    Results are cached; the target is fixed per run and mods share most game versions.
     """
     try:
         # Parse versions like "1.21.7" -> [1, 21, 7]
@@ -300,10 +546,8 @@ def check_server_compatibility(project_slug: str) -> str:
     Returns: "required", "optional", "unsupported"
     """
     try:
-        url = f"{MODRINTH_API}/project/{project_slug}"
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            project_data = resp.json()
+        project_data = get_project_info(project_slug)
+        if project_data:
             return project_data.get('server_side', 'unsupported')
     except Exception as e:
         print(f"{Colors.YELLOW}⚠️  Warning: Could not check server compatibility for {project_slug}: {e}{Colors.RESET}")
@@ -321,8 +565,11 @@ def generate_mrpack(modpack_name: str, version_id: str, mc_version: str, modload
           - url (str): direct Modrinth download URL
           - sha1 (str): file hash (optional, will be calculated if not given)
           - project_slug (str): Modrinth project slug for server compatibility check
+          - server_side (str): project's server support (optional, looked up by slug if not given)
           - env (dict): original env settings (optional)
     """
+    import zipfile
+
     if output_file is None:
         suffix = "-server" if mode == "server" else ""
         output_file = f"{modpack_name.replace(' ', '_')}{suffix}.mrpack"
@@ -351,7 +598,7 @@ def generate_mrpack(modpack_name: str, version_id: str, mc_version: str, modload
         if mode == "server":
             project_slug = mod.get('project_slug')
             if project_slug:
-                server_side = check_server_compatibility(project_slug)
+                server_side = mod.get('server_side') or check_server_compatibility(project_slug)
                 if server_side == 'unsupported':
                     print(f"{Colors.YELLOW}⏭️  Skipping {mod['filename']} (server unsupported){Colors.RESET}")
                     skipped_mods += 1
@@ -363,8 +610,7 @@ def generate_mrpack(modpack_name: str, version_id: str, mc_version: str, modload
 
         # Calculate hash if not provided and file exists
         if not sha1 and os.path.exists(local_file):
-            with open(local_file, "rb") as f:
-                sha1 = hashlib.sha1(f.read()).hexdigest()
+            sha1 = sha1_file(local_file)
         elif not sha1:
             print(f"{Colors.YELLOW}⚠️  Warning: No hash available for {mod['filename']}{Colors.RESET}")
             continue
@@ -383,77 +629,74 @@ def generate_mrpack(modpack_name: str, version_id: str, mc_version: str, modload
         })
         included_mods += 1
 
-    # Create temporary directory for .mrpack contents
-    temp_mrpack_dir = "temp_mrpack"
-    os.makedirs(temp_mrpack_dir, exist_ok=True)
-    
-    try:
-        # Write modrinth.index.json
-        with open(os.path.join(temp_mrpack_dir, "modrinth.index.json"), "w") as f:
-            json.dump(index, f, indent=2)
+    # Write the .mrpack zip directly from the index and source files
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=MRPACK_COMPRESSLEVEL) as z:
+        z.writestr("modrinth.index.json", json_dumps_pretty(index))
 
-        # Copy overrides folder (if it exists)
+        # Add overrides folder (if it exists)
         if os.path.exists(overrides_folder):
-            shutil.copytree(overrides_folder, os.path.join(temp_mrpack_dir, "overrides"), dirs_exist_ok=True)
-            print(f"{Colors.GREEN}📁 Copied overrides folder{Colors.RESET}")
+            for root, _, files in os.walk(overrides_folder, followlinks=True):
+                for file in files:
+                    abs_path = os.path.join(root, file)
+                    rel_path = os.path.relpath(abs_path, overrides_folder)
+                    if file.lower().endswith(STORED_EXTENSIONS):
+                        z.write(abs_path, os.path.join("overrides", rel_path), compress_type=zipfile.ZIP_STORED)
+                    else:
+                        z.write(abs_path, os.path.join("overrides", rel_path))
+            print(f"{Colors.GREEN}📁 Added overrides folder{Colors.RESET}")
 
-        # Copy optional files if they exist
+        # Add optional files if they exist
         optional_files = ["icon.png", "README.md"]
         for optional_file in optional_files:
             if os.path.exists(optional_file):
-                shutil.copy2(optional_file, temp_mrpack_dir)
+                z.write(optional_file, optional_file)
                 print(f"{Colors.GREEN}📄 Added {optional_file}{Colors.RESET}")
 
-        # Create .mrpack zip
-        with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as z:
-            for root, _, files in os.walk(temp_mrpack_dir):
-                for file in files:
-                    abs_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(abs_path, temp_mrpack_dir)
-                    z.write(abs_path, rel_path)
-
-        print(f"{Colors.GREEN}✅ {mode.capitalize()} .mrpack created: {output_file}{Colors.RESET}")
-        print(f"{Colors.GREEN}📊 Contains {included_mods} mods{Colors.RESET}")
-        if skipped_mods > 0:
-            print(f"{Colors.YELLOW}⏭️  Skipped {skipped_mods} server-incompatible mods{Colors.RESET}")
-        
-    finally:
-        # Cleanup temp directory
-        if os.path.exists(temp_mrpack_dir):
-            shutil.rmtree(temp_mrpack_dir)
+    print(f"{Colors.GREEN}✅ {mode.capitalize()} .mrpack created: {output_file}{Colors.RESET}")
+    print(f"{Colors.GREEN}📊 Contains {included_mods} mods{Colors.RESET}")
+    if skipped_mods > 0:
+        print(f"{Colors.YELLOW}⏭️  Skipped {skipped_mods} server-incompatible mods{Colors.RESET}")
 
 # -------------------- Main Logic --------------------
-def main():
-    args = parse_args()
+def main(argv: List[str] | None = None, stop_event: threading.Event | None = None):
+    """
+    Run the updater with the given arguments (sys.argv by default).
+    If stop_event is given, setting it aborts the run with UpdateStopped while
+    main() waits for lookups or downloads, and cancels running downloads.
+    """
+    args = parse_args(argv)
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+    # Project info is cached within a run only; the GUI calls main() repeatedly
+    get_project_info.cache_clear()
     modpack_path = os.path.expanduser(args.modpack_dir)  # Expand ~ to full path
-    temp_dir = None
-    
-    if modpack_path.endswith('.mrpack'):
-        print(f"Extracting .mrpack file: {modpack_path}")
-        temp_dir = extract_mrpack(modpack_path)
-        modpack_dir = temp_dir
-        print(f"Extracted to: {modpack_dir}")
-        
-        # Debug: List contents of extracted directory
-        print("Contents of extracted directory:")
-        for item in os.listdir(modpack_dir):
-            item_path = os.path.join(modpack_dir, item)
-            if os.path.isdir(item_path):
-                print(f"  📁 {item}/")
-            else:
-                print(f"  📄 {item}")
-    else:
-        modpack_dir = modpack_path
     
     try:
-        index_path = find_index_json(modpack_dir)
-        print(f"Found index.json at: {index_path}")
-        with open(index_path, 'r', encoding='utf-8') as f:
-            index = json.load(f)
+        if modpack_path.endswith('.mrpack'):
+            # Only the index is needed, so read it straight from the archive
+            print(f"Reading .mrpack file: {modpack_path}")
+            with zipfile.ZipFile(modpack_path, 'r') as zf:
+                names = zf.namelist()
+                
+                # Debug: List top-level contents of the archive
+                print("Contents of .mrpack file:")
+                top_level = {}
+                for name in names:
+                    item, sep, _ = name.partition('/')
+                    top_level[item] = top_level.get(item, False) or bool(sep)
+                for item, is_dir in top_level.items():
+                    print(f"  📁 {item}/" if is_dir else f"  📄 {item}")
+                
+                index_name = find_index_in_mrpack(names)
+                print(f"Found index.json at: {index_name}")
+                index = json_loads(zf.read(index_name))
+        else:
+            index_path = find_index_json(modpack_path)
+            print(f"Found index.json at: {index_path}")
+            with open(index_path, 'rb') as f:
+                index = json_loads(f.read())
     except Exception as e:
         print(f"{Colors.RED}Error loading index.json: {e}{Colors.RESET}")
-        if temp_dir:
-            shutil.rmtree(temp_dir)
         sys.exit(1)
 
     mc_version = index.get('dependencies', {}).get('minecraft')
@@ -476,129 +719,182 @@ def main():
     updated, uptodate, missing, errors = [], [], [], []
     mod_list_for_mrpack = []  # Collect mod data for .mrpack generation
 
-    for mod in mods:
-        filename = mod.get('path', '').split('/')[-1] if mod.get('path') else ''
-        downloads = mod.get('downloads', [])
-        sha1_hash = mod.get('hashes', {}).get('sha1')
-        
-        if not downloads and not sha1_hash:
-            errors.append(f"No download URL or hash for mod: {filename}")
-            continue
-        
-        print(f"Checking {filename}...")
-        
-        # Try to get project ID from download URL first
-        project_id = None
-        if downloads:
-            project_id = extract_project_id_from_url(downloads[0])
-        
-        # If that fails, try to get version info by hash
-        version_info = None
-        if sha1_hash:
-            version_info = get_version_info_by_hash(sha1_hash)
-            if version_info:
-                project_id = version_info.get('project_id')
-        
-        if not project_id:
-            errors.append(f"Could not determine project ID for mod: {filename}")
-            print(f"{Colors.RED}❌ {filename}: Could not determine project ID{Colors.RESET}")
-            continue
+    # Look mods up on Modrinth concurrently; results are handled below in
+    # modpack order, while later lookups are still in flight
+    checkable = [mod for mod in mods if mod.get('downloads') or mod.get('hashes', {}).get('sha1')]
+    versions_by_hash, projects = prefetch_mods(checkable)
+    executor = ThreadPoolExecutor(max_workers=LOOKUP_WORKERS)
+    compatible_loaders = get_compatible_loaders(loaders)
+    lookups = iter([executor.submit(lookup_mod, mod, mc_version, loaders, versions_by_hash, projects, compatible_loaders)
+                    for mod in checkable])
+    # Downloads start as soon as a mod is checked and are installed after all checks
+    download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    downloads_cancelled = threading.Event()
+    pending_downloads = []
+    
+    try:
+        for mod in mods:
+            filename = mod.get('path', '').split('/')[-1] if mod.get('path') else ''
+            downloads = mod.get('downloads', [])
+            sha1_hash = mod.get('hashes', {}).get('sha1')
             
-        # Get project info
-        project = get_project_info(project_id)
-        if not project:
-            missing.append({'slug': project_id})
-            print(f"{Colors.RED}❌ {filename}: Project not found on Modrinth{Colors.RESET}")
-            continue
+            if not downloads and not sha1_hash:
+                errors.append(f"No download URL or hash for mod: {filename}")
+                continue
             
-        name = project.get('title', project_id)
-        current_version = version_info.get('version_number', 'unknown') if version_info else 'unknown'
-        
-        # Check if mod file exists locally
-        mod_file_path = os.path.join(mods_dir, filename) if filename else None
-        mod_exists_locally = mod_file_path and os.path.exists(mod_file_path)
-        
-        latest, is_newer = get_latest_version(project_id, mc_version, loaders, current_version, version_info)
-        
-        if latest and is_newer:
-            # Download new file
-            primary_file = next((f for f in latest['files'] if f['primary']), latest['files'][0])
-            url = primary_file['url']
-            new_jar = os.path.join(tempfile.gettempdir(), primary_file['filename'])
+            print(f"Checking {filename}...")
             
-            if download_file(url, new_jar):
-                try:
-                    if mod_exists_locally:
-                        # Update existing mod
-                        backup_and_replace_mod(mods_dir, filename, new_jar)
-                    else:
-                        # Download new mod
-                        final_path = os.path.join(mods_dir, primary_file['filename'])
-                        shutil.move(new_jar, final_path)
-                        
-                    updated.append({
-                        'name': name,
-                        'slug': project_id,
-                        'old_version': current_version,
-                        'new_version': latest['version_number'],
-                        'changelog': latest.get('changelog', '').strip()
-                    })
-                    
-                    # Add mod data for .mrpack generation
-                    mod_list_for_mrpack.append({
-                        'filename': primary_file['filename'],
-                        'url': url,
-                        'sha1': primary_file.get('hashes', {}).get('sha1'),
-                        'project_slug': project_id,
-                        'env': mod.get('env', {"client": "required", "server": "optional"})
-                    })
-                    
-                    print(f"{Colors.GREEN}✅ {name}: Updated {current_version} → {latest['version_number']}{Colors.RESET}")
-                except Exception as e:
-                    errors.append(f"Failed to update {project_id}: {e}")
-                    print(f"{Colors.RED}❌ {name}: Failed to update ({e}){Colors.RESET}")
-            else:
-                errors.append(f"Failed to download new version for {project_id}")
-                print(f"{Colors.RED}❌ {name}: Failed to download new version{Colors.RESET}")
+            project_id, version_info, project, latest, is_newer, messages = wait_for_result(next(lookups), stop_event)
+            for message in messages:
+                print(message)
+            if not project_id:
+                errors.append(f"Could not determine project ID for mod: {filename}")
+                print(f"{Colors.RED}❌ {filename}: Could not determine project ID{Colors.RESET}")
+                continue
                 
-        elif latest and not is_newer:
-            # Download current version if not exists locally
-            if not mod_exists_locally:
-                # Use the original download URL from the modpack
-                download_url = downloads[0] if downloads else latest['files'][0]['url']
-                download_filename = filename or latest['files'][0]['filename']
-                new_jar = os.path.join(tempfile.gettempdir(), download_filename)
+            if not project:
+                missing.append({'slug': project_id})
+                print(f"{Colors.RED}❌ {filename}: Project not found on Modrinth{Colors.RESET}")
+                continue
                 
-                if download_file(download_url, new_jar):
-                    final_path = os.path.join(mods_dir, download_filename)
-                    shutil.move(new_jar, final_path)
-                    print(f"{Colors.YELLOW}📥 {name}: Downloaded current version {current_version}{Colors.RESET}")
-                else:
-                    errors.append(f"Failed to download current version for {project_id}")
-                    print(f"{Colors.RED}❌ {name}: Failed to download current version{Colors.RESET}")
-            else:
-                print(f"{Colors.YELLOW}🟡 {name}: Already up-to-date (file exists){Colors.RESET}")
-                    
-            uptodate.append({'name': name, 'slug': project_id, 'version': current_version})
+            name = project.get('title', project_id)
+            current_version = version_info.get('version_number', 'unknown') if version_info else 'unknown'
+            
+            # Check if mod file exists locally
+            mod_file_path = os.path.join(mods_dir, filename) if filename else None
+            mod_exists_locally = mod_file_path and os.path.exists(mod_file_path)
             
-            # Add mod data for .mrpack generation (use current version info)
-            if latest:
+            if latest and is_newer:
+                # Download new file
                 primary_file = next((f for f in latest['files'] if f['primary']), latest['files'][0])
-                mod_list_for_mrpack.append({
+                url = primary_file['url']
+                new_jar = download_path(mods_dir, primary_file['filename'])
+                
+                # Add mod data for .mrpack generation now to keep modpack order;
+                # it is dropped again if the update fails
+                mrpack_entry = {
+                    'filename': primary_file['filename'],
+                    'url': url,
+                    'sha1': primary_file.get('hashes', {}).get('sha1'),
+                    'project_slug': project_id,
+                    'server_side': project.get('server_side'),
+                    'env': mod.get('env', {"client": "required", "server": "optional"})
+                }
+                mod_list_for_mrpack.append(mrpack_entry)
+                pending_downloads.append({
+                    'download': download_executor.submit(download_file, url, new_jar, downloads_cancelled),
+                    'kind': 'update',
+                    'name': name,
+                    'project_id': project_id,
+                    'new_jar': new_jar,
+                    'filename': primary_file['filename'],
+                    'replaces': filename if mod_exists_locally else None,
+                    'old_version': current_version,
+                    'latest': latest,
+                    'mrpack_entry': mrpack_entry,
+                })
+                
+            elif latest and not is_newer:
+                # Mod data for .mrpack generation (use current version info)
+                primary_file = next((f for f in latest['files'] if f['primary']), latest['files'][0])
+                mrpack_entry = {
                     'filename': filename or primary_file['filename'],
                     'url': downloads[0] if downloads else primary_file['url'],
                     'sha1': sha1_hash or primary_file.get('hashes', {}).get('sha1'),
                     'project_slug': project_id,
+                    'server_side': project.get('server_side'),
                     'env': mod.get('env', {"client": "required", "server": "optional"})
-                })
+                }
+                
+                # Download current version if not exists locally
+                if not mod_exists_locally:
+                    # Use the original download URL from the modpack
+                    download_url = downloads[0] if downloads else latest['files'][0]['url']
+                    download_filename = filename or latest['files'][0]['filename']
+                    new_jar = download_path(mods_dir, download_filename)
+                    
+                    pending_downloads.append({
+                        'download': download_executor.submit(download_file, download_url, new_jar, downloads_cancelled),
+                        'kind': 'current',
+                        'name': name,
+                        'project_id': project_id,
+                        'new_jar': new_jar,
+                        'filename': download_filename,
+                        'old_version': current_version,
+                        'mrpack_entry': mrpack_entry,
+                    })
+                else:
+                    print(f"{Colors.YELLOW}🟡 {name}: Already up-to-date (file exists){Colors.RESET}")
+                    
+                uptodate.append({'name': name, 'slug': project_id, 'version': current_version})
+                mod_list_for_mrpack.append(mrpack_entry)
             
-        elif not latest:
-            # Couldn't find any version for this mod
-            missing.append({'slug': project_id})
-            print(f"{Colors.RED}❌ {name}: No compatible versions found{Colors.RESET}")
-        else:
-            errors.append(f"Unknown error for {project_id}")
-            print(f"{Colors.RED}❌ {name}: Unknown error{Colors.RESET}")
+            elif not latest:
+                # Couldn't find any version for this mod
+                missing.append({'slug': project_id})
+                print(f"{Colors.RED}❌ {name}: No compatible versions found{Colors.RESET}")
+            else:
+                errors.append(f"Unknown error for {project_id}")
+                print(f"{Colors.RED}❌ {name}: Unknown error{Colors.RESET}")
+        
+        # Install downloaded mods in modpack order
+        for pending in pending_downloads:
+            name, project_id, new_jar = pending['name'], pending['project_id'], pending['new_jar']
+            downloaded, sha1 = wait_for_result(pending['download'], stop_event)
+            if downloaded and not pending['mrpack_entry']['sha1']:
+                # Hash computed while downloading, so .mrpack generation never re-reads the jar
+                pending['mrpack_entry']['sha1'] = sha1
+            
+            if pending['kind'] == 'update':
+                latest = pending['latest']
+                if downloaded:
+                    try:
+                        if pending['replaces']:
+                            # Update existing mod
+                            backup_and_replace_mod(mods_dir, pending['replaces'], new_jar, pending['filename'])
+                        else:
+                            # Download new mod
+                            final_path = os.path.join(mods_dir, pending['filename'])
+                            os.replace(new_jar, final_path)
+                        
+                        updated.append({
+                            'name': name,
+                            'slug': project_id,
+                            'old_version': pending['old_version'],
+                            'new_version': latest['version_number'],
+                            'changelog': latest.get('changelog', '').strip()
+                        })
+                        
+                        print(f"{Colors.GREEN}✅ {name}: Updated {pending['old_version']} → {latest['version_number']}{Colors.RESET}")
+                    except Exception as e:
+                        mod_list_for_mrpack.remove(pending['mrpack_entry'])
+                        errors.append(f"Failed to update {project_id}: {e}")
+                        print(f"{Colors.RED}❌ {name}: Failed to update ({e}){Colors.RESET}")
+                else:
+                    mod_list_for_mrpack.remove(pending['mrpack_entry'])
+                    errors.append(f"Failed to download new version for {project_id}")
+                    print(f"{Colors.RED}❌ {name}: Failed to download new version{Colors.RESET}")
+            else:
+                if downloaded:
+                    final_path = os.path.join(mods_dir, pending['filename'])
+                    os.replace(new_jar, final_path)
+                    print(f"{Colors.YELLOW}📥 {name}: Downloaded current version {pending['old_version']}{Colors.RESET}")
+                else:
+                    errors.append(f"Failed to download current version for {project_id}")
+                    print(f"{Colors.RED}❌ {name}: Failed to download current version{Colors.RESET}")
+    finally:
+        # Don't start lookups or downloads nobody will read if the run is aborted.
+        # Running downloads are stopped and waited for, so none is still writing
+        # into mods/ when the next run (e.g. from the GUI) starts
+        executor.shutdown(wait=False, cancel_futures=True)
+        downloads_cancelled.set()
+        download_executor.shutdown(wait=True, cancel_futures=True)
+        for pending in pending_downloads:
+            # Installed downloads were renamed away; remove any part file left over
+            try:
+                os.remove(pending['new_jar'])
+            except OSError:
+                pass
 
     # Use modpack name for changelog
     changelog_path = f'{modpack_name}_changelog.md'
@@ -645,9 +941,6 @@ def main():
     print(f"{Colors.YELLOW}🟡 Up-to-date: {len(uptodate)}{Colors.RESET}")
     print(f"{Colors.RED}❌ Missing/Failed: {len(missing) + len(errors)}{Colors.RESET}")
     print(f"\n{Colors.GREEN}Mods exported to: {mods_dir}{Colors.RESET}")
-    
-    if temp_dir:
-        shutil.rmtree(temp_dir)
 
 if __name__ == '__main__':
     main()